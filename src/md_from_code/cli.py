@@ -2,14 +2,23 @@
 Command-line interface for md-from-code.
 """
 
+import multiprocessing
+import os
+import re
+import stat
 import sys
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+)
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Optional
-from fnmatch import fnmatch
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+from fnmatch import translate
 import click
 from rich.console import Console
 from rich.progress import Progress, TaskID
 from rich.table import Table
+from rich.traceback import Traceback
 
 from .core import MarkdownGenerator
 from .registry import FileTypeInfo
@@ -17,6 +26,9 @@ from .registry import FileTypeInfo
 
 console = Console()
 
+# Compiled exclude matchers, keyed by the tuple of patterns they were built from
+_exclude_cache: Dict[Tuple[str, ...], Pattern[str]] = {}
+
 
 @click.command()
 @click.argument('input_files', nargs=-1, required=True, type=click.Path(exists=True))
@@ -34,6 +46,8 @@ console = Console()
 @click.option('--max-file-size', type=int, default=10*1024*1024, help='Maximum file size in bytes (default: 10MB)')
 @click.option('--encoding', help='Force specific file encoding')
 @click.option('--indent', type=int, default=2, help='Indentation for structured data pretty-printing')
+@click.option('--sort-keys', is_flag=True, help='Sort object keys when pretty-printing JSON')
+@click.option('--preserve-formatting', is_flag=True, help='Keep YAML files as written instead of re-formatting them')
 @click.option('--no-metadata', is_flag=True, help='Exclude file metadata from output')
 @click.option('--no-stats', is_flag=True, help='Exclude code/structure statistics from output')
 @click.option('--no-toc', is_flag=True, help='Exclude table of contents from output')
@@ -41,6 +55,7 @@ console = Console()
 @click.option('--frontmatter', help='Additional YAML frontmatter as JSON string')
 @click.option('--list-formats', is_flag=True, help='List all supported file formats and exit')
 @click.option('--validate-only', is_flag=True, help='Only validate files without generating output')
+@click.option('-j', '--jobs', type=click.IntRange(min=1), help='Number of worker processes (default: CPU count)')
 @click.option('--quiet', '-q', is_flag=True, help='Suppress non-error output')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 def main(
@@ -59,6 +74,8 @@ def main(
     max_file_size: int,
     encoding: Optional[str],
     indent: int,
+    sort_keys: bool,
+    preserve_formatting: bool,
     no_metadata: bool,
     no_stats: bool,
     no_toc: bool,
@@ -66,6 +83,7 @@ def main(
     frontmatter: Optional[str],
     list_formats: bool,
     validate_only: bool,
+    jobs: Optional[int],
     quiet: bool,
     verbose: bool,
 ) -> None:
@@ -94,8 +112,9 @@ def main(
         _process_files(
             generator, input_paths, output, output_dir, recursive, exclude,
             format_override, template, title, description, tags, max_lines,
-            encoding, indent, no_metadata, no_stats, no_toc, no_line_numbers,
-            frontmatter, validate_only, quiet, verbose
+            encoding, indent, sort_keys, preserve_formatting, no_metadata,
+            no_stats, no_toc, no_line_numbers, frontmatter, validate_only,
+            jobs, quiet, verbose
         )
 
     except KeyboardInterrupt:
@@ -111,70 +130,169 @@ def main(
 def _discover_files(
     input_paths: List[Path],
     recursive: bool,
-    exclude_patterns: List[str],
+    exclude_matcher: Optional[Pattern[str]],
     verbose: bool = False
-) -> List[Path]:
+) -> Iterator[Tuple[Path, Optional[os.stat_result]]]:
     """
     Discover files from input paths, applying recursive search and exclusions.
 
+    Files are yielded as they are found so processing can start before the
+    whole tree has been walked.
+
     Args:
         input_paths: List of file or directory paths
         recursive: Whether to recursively search directories
-        exclude_patterns: List of patterns to exclude (e.g., ['*.md', '*.pyc'])
+        exclude_matcher: Compiled exclude patterns (see _compile_exclude_patterns),
+            or None to keep every file
         verbose: Enable verbose output
 
-    Returns:
-        List of discovered file paths
+    Yields:
+        (file path, stat result) pairs. The stat result is the one cached on
+        the directory entry when available, otherwise None.
     """
-    discovered_files = []
-
     for input_path in input_paths:
-        if input_path.is_file():
-            # Single file - check if it matches exclusion patterns
-            if not _should_exclude(input_path, exclude_patterns):
-                discovered_files.append(input_path)
-            elif verbose:
-                console.print(f"[yellow]Excluded:[/yellow] {input_path}")
+        # Inputs were validated to exist by click; one stat tells directories
+        # apart and is reused downstream for files
+        input_stat = input_path.stat()
 
-        elif input_path.is_dir():
+        if stat.S_ISDIR(input_stat.st_mode):
             if recursive:
                 # Recursively walk directory
-                for file_path in input_path.rglob('*'):
-                    if file_path.is_file() and not _should_exclude(file_path, exclude_patterns):
-                        discovered_files.append(file_path)
-                    elif verbose and file_path.is_file():
-                        console.print(f"[yellow]Excluded:[/yellow] {file_path}")
+                entries: Iterator[os.DirEntry] = _walk_directory(str(input_path), verbose)
             else:
                 # Only process files directly in the directory
-                for file_path in input_path.iterdir():
-                    if file_path.is_file() and not _should_exclude(file_path, exclude_patterns):
-                        discovered_files.append(file_path)
-                    elif verbose and file_path.is_file():
-                        console.print(f"[yellow]Excluded:[/yellow] {file_path}")
+                entries = _scan_directory(str(input_path))
+
+            if exclude_matcher is None:
+                # Nothing to filter; skip the per-entry exclusion check
+                for entry in entries:
+                    yield Path(entry.path), _entry_stat(entry)
+                continue
+
+            for entry in entries:
+                if not _should_exclude(entry.name, entry.path, exclude_matcher):
+                    yield Path(entry.path), _entry_stat(entry)
+                elif verbose:
+                    console.print(f"[yellow]Excluded:[/yellow] {entry.path}")
+
+        else:
+            # Single file - check if it matches exclusion patterns
+            if not _should_exclude(input_path.name, str(input_path), exclude_matcher):
+                yield input_path, input_stat
+            elif verbose:
+                console.print(f"[yellow]Excluded:[/yellow] {input_path}")
+
+
+def _scan_directory(directory: str) -> Iterator[os.DirEntry]:
+    """
+    Yield file entries directly inside a directory.
+
+    Args:
+        directory: Directory to scan
+
+    Yields:
+        os.DirEntry for each file found
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                yield entry
+
+
+def _walk_directory(directory: str, verbose: bool = False) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield file entries below a directory.
 
-    return discovered_files
+    Uses os.scandir so the file/directory checks are answered from the cached
+    directory entry instead of issuing a stat call per path. Symlinked
+    directories are not followed, matching Path.rglob. Directories are kept
+    on an explicit stack rather than nesting generators, so yielding an entry
+    costs the same regardless of how deep it is. Directories that cannot be
+    read are skipped, as Path.rglob does.
 
+    Args:
+        directory: Directory to walk
+        verbose: Report skipped directories
 
-def _should_exclude(file_path: Path, exclude_patterns: List[str]) -> bool:
+    Yields:
+        os.DirEntry for each file found
+    """
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError as e:
+            if verbose:
+                console.print(f"[yellow]Skipped unreadable directory:[/yellow] {current} ({e})")
+            continue
+
+        subdirectories = []
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+        # Reversed so subdirectories are visited in scandir order
+        pending.extend(reversed(subdirectories))
+
+
+def _entry_stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    """Return the (cached) stat result for a directory entry, or None on error."""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def _compile_exclude_patterns(exclude_patterns: List[str]) -> Optional[Pattern[str]]:
+    """
+    Compile fnmatch-style exclude patterns into a single regular expression.
+
+    Args:
+        exclude_patterns: List of patterns to exclude (e.g., ['*.md', '*.pyc'])
+
+    Returns:
+        Compiled union of all patterns, or None if there are no patterns
+    """
+    if not exclude_patterns:
+        return None
+
+    key = tuple(exclude_patterns)
+    matcher = _exclude_cache.get(key)
+    if matcher is None:
+        matcher = re.compile('|'.join(
+            f'(?:{translate(os.path.normcase(pattern))})' for pattern in exclude_patterns
+        ))
+        _exclude_cache[key] = matcher
+    return matcher
+
+
+def _should_exclude(
+    file_name: str,
+    file_path: str,
+    exclude_matcher: Optional[Pattern[str]]
+) -> bool:
     """
     Check if a file should be excluded based on patterns.
 
     Args:
-        file_path: Path to check
-        exclude_patterns: List of patterns to match against
+        file_name: Base name of the file
+        file_path: Full path of the file as a string
+        exclude_matcher: Compiled exclude patterns, or None to keep every file
 
     Returns:
         True if file should be excluded, False otherwise
     """
-    file_name = file_path.name
-    file_relative = str(file_path)
-
-    for pattern in exclude_patterns:
-        # Match against filename and full path
-        if fnmatch(file_name, pattern) or fnmatch(file_relative, pattern):
-            return True
+    if exclude_matcher is None:
+        return False
 
-    return False
+    # Match against filename and full path
+    return bool(
+        exclude_matcher.match(os.path.normcase(file_name))
+        or exclude_matcher.match(os.path.normcase(file_path))
+    )
 
 
 def _list_supported_formats() -> None:
@@ -223,12 +341,15 @@ def _process_files(
     max_lines: Optional[int],
     encoding: Optional[str],
     indent: int,
+    sort_keys: bool,
+    preserve_formatting: bool,
     no_metadata: bool,
     no_stats: bool,
     no_toc: bool,
     no_line_numbers: bool,
     frontmatter: Optional[str],
     validate_only: bool,
+    jobs: Optional[int],
     quiet: bool,
     verbose: bool,
 ) -> None:
@@ -236,18 +357,27 @@ def _process_files(
 
     # Parse exclude patterns
     exclude_patterns = [p.strip() for p in exclude.split(',') if p.strip()] if exclude else []
+    exclude_matcher = _compile_exclude_patterns(exclude_patterns)
 
     # Discover files if recursive mode is enabled or if we have directories
+    input_files: Iterator[Tuple[Path, Optional[os.stat_result]]]
     has_directories = any(p.is_dir() for p in input_paths)
-    if recursive or has_directories:
+    discovering = recursive or has_directories
+    if discovering:
         if not quiet and verbose:
             console.print(f"[cyan]Discovering files (recursive={recursive})...[/cyan]")
-        input_paths = _discover_files(input_paths, recursive, exclude_patterns, verbose)
-        if not quiet:
-            console.print(f"[cyan]Found {len(input_paths)} file(s) to process[/cyan]")
+        input_files = _discover_files(input_paths, recursive, exclude_matcher, verbose)
+    else:
+        input_files = iter([(p, None) for p in input_paths])
+
+    # Discovery is lazy; peeking at two files is enough to choose the output
+    # strategy without waiting for the walk to finish
+    first_files = list(islice(input_files, 2))
+    multiple_files = len(first_files) > 1
+    input_files = chain(first_files, input_files)
 
     # If no files found, exit early
-    if not input_paths:
+    if not first_files:
         if not quiet:
             console.print("[yellow]No files found to process[/yellow]")
         return
@@ -272,6 +402,8 @@ def _process_files(
         'max_lines': max_lines,
         'encoding': encoding,
         'indent': indent,
+        'sort_keys': sort_keys,
+        'preserve_formatting': preserve_formatting,
         'include_metadata': not no_metadata,
         'include_stats': not no_stats,
         'include_toc': not no_toc,
@@ -280,8 +412,8 @@ def _process_files(
     }
 
     # Determine output strategy
-    single_file = len(input_paths) == 1 and output and not output_dir
-    use_output_dir = output_dir or (len(input_paths) > 1 and output)
+    single_file = not multiple_files and output and not output_dir
+    use_output_dir = output_dir or (multiple_files and output)
 
     if use_output_dir:
         output_path = Path(output_dir or output)
@@ -292,17 +424,24 @@ def _process_files(
     else:
         output_path = None
 
+    # Output directories are either created above or are the input's own
+    # directory, so generate_markdown never needs to create them per file
+    kwargs['skip_mkdir'] = True
+
     # Process files
     success_count = 0
     error_count = 0
 
     with Progress(console=console, disable=quiet) as progress:
-        task = progress.add_task("Processing files...", total=len(input_paths))
+        # The total stays indeterminate until discovery has finished
+        task = progress.add_task(
+            "Processing files...", total=None if discovering else len(input_paths)
+        )
 
-        for input_path in input_paths:
-            try:
-                if not quiet:
-                    progress.console.print(f"Processing: {input_path}")
+        def build_tasks() -> Iterator[Tuple[Path, Optional[os.stat_result], Optional[Path]]]:
+            found_count = 0
+            for input_path, stat_result in input_files:
+                found_count += 1
 
                 # Determine output file path
                 if single_file:
@@ -312,30 +451,36 @@ def _process_files(
                 else:
                     output_file = input_path.parent / f"{input_path.name}.md"
 
-                # Generate markdown
-                if validate_only:
-                    # Just validate without generating output
-                    generator.generate_markdown(input_path, **kwargs)
-                    if verbose:
-                        console.print(f"[green]✓[/green] Valid: {input_path}")
-                else:
-                    markdown_content = generator.generate_markdown(
-                        input_path, output_file, **kwargs
-                    )
+                yield input_path, stat_result, output_file
 
-                    if not quiet:
-                        if output_file:
-                            console.print(f"[green]→[/green] Generated: {output_file}")
-                        else:
-                            console.print(f"[green]✓[/green] Processed: {input_path}")
+            progress.update(task, total=found_count)
+            if discovering and not quiet:
+                progress.console.print(f"[cyan]Found {found_count} file(s) to process[/cyan]")
 
-                success_count += 1
+        for input_path, output_file, error in _run_tasks(
+            generator, build_tasks(), validate_only, kwargs,
+            jobs if multiple_files else 1
+        ):
+            if not quiet:
+                progress.console.print(f"Processing: {input_path}")
 
-            except Exception as e:
+            if error is not None:
                 error_count += 1
-                console.print(f"[red]✗[/red] Error processing {input_path}: {str(e)}")
+                console.print(f"[red]✗[/red] Error processing {input_path}: {str(error)}")
                 if verbose:
-                    console.print_exception()
+                    console.print(Traceback.from_exception(
+                        type(error), error, error.__traceback__
+                    ))
+            else:
+                success_count += 1
+                if validate_only:
+                    if verbose:
+                        console.print(f"[green]✓[/green] Valid: {input_path}")
+                elif not quiet:
+                    if output_file:
+                        console.print(f"[green]→[/green] Generated: {output_file}")
+                    else:
+                        console.print(f"[green]✓[/green] Processed: {input_path}")
 
             progress.advance(task)
 
@@ -350,5 +495,122 @@ def _process_files(
         sys.exit(1)
 
 
+def _run_tasks(
+    generator: MarkdownGenerator,
+    tasks: Iterable[Tuple[Path, Optional[os.stat_result], Optional[Path]]],
+    validate_only: bool,
+    kwargs: Dict[str, Any],
+    jobs: Optional[int],
+) -> Iterator[Tuple[Path, Optional[Path], Optional[BaseException]]]:
+    """
+    Process files serially or across a pool of worker processes.
+
+    Tasks are consumed lazily. In parallel mode at most two tasks per worker
+    are in flight, so results stream out while the task source (e.g. file
+    discovery) is still running.
+
+    Args:
+        generator: Generator used when processing in this process
+        tasks: Iterable of (input path, stat result, output path) tuples
+        validate_only: Whether to skip writing output
+        kwargs: Options passed through to generate_markdown
+        jobs: Number of worker processes (default: CPU count)
+
+    Yields:
+        (input path, output path, error or None) as each file completes
+    """
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1:
+        for input_path, stat_result, output_file in tasks:
+            try:
+                _process_one(
+                    generator, input_path, stat_result, output_file, validate_only, kwargs
+                )
+                yield input_path, output_file, None
+            except Exception as e:
+                yield input_path, output_file, e
+        return
+
+    # Workers are started while Rich's refresh thread is running, and forking
+    # a multi-threaded process can deadlock on locks held by that thread
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(
+            generator.template_dir,
+            generator.code_processor.max_file_size,
+            generator._timestamp,
+        ),
+    ) as executor:
+        pending: Dict[Future, Tuple[Path, Optional[Path]]] = {}
+        for input_path, stat_result, output_file in tasks:
+            future = executor.submit(
+                _process_in_worker, input_path, stat_result, output_file,
+                validate_only, kwargs
+            )
+            pending[future] = (input_path, output_file)
+
+            if len(pending) >= jobs * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for done_future in done:
+                    done_path, done_output = pending.pop(done_future)
+                    yield done_path, done_output, done_future.exception()
+
+        for done_future in as_completed(pending):
+            done_path, done_output = pending[done_future]
+            yield done_path, done_output, done_future.exception()
+
+
+def _process_one(
+    generator: MarkdownGenerator,
+    input_path: Path,
+    stat_result: Optional[os.stat_result],
+    output_file: Optional[Path],
+    validate_only: bool,
+    kwargs: Dict[str, Any],
+) -> None:
+    """Generate (or just validate) markdown for a single file."""
+    if validate_only:
+        # Just validate without rendering or writing output; structure
+        # statistics are never shown, so skip computing them
+        generator.validate(
+            input_path, stat_result=stat_result, analyze_structure=False, **kwargs
+        )
+    else:
+        generator.generate_markdown(
+            input_path, output_file, stat_result=stat_result, **kwargs
+        )
+
+
+# Per-process generator, created once by _init_worker in each pool worker
+_worker_generator: Optional[MarkdownGenerator] = None
+
+
+def _init_worker(template_dir: Optional[Path], max_file_size: int, timestamp: str) -> None:
+    """Build the generator a pool worker reuses for every file it processes."""
+    global _worker_generator
+    _worker_generator = MarkdownGenerator(template_dir)
+    # Every file in the run reports the parent's generation timestamp
+    _worker_generator._timestamp = timestamp
+    _worker_generator.code_processor.max_file_size = max_file_size
+    _worker_generator.structured_processor.max_file_size = max_file_size
+
+
+def _process_in_worker(
+    input_path: Path,
+    stat_result: Optional[os.stat_result],
+    output_file: Optional[Path],
+    validate_only: bool,
+    kwargs: Dict[str, Any],
+) -> None:
+    """Pool entry point: process one file with this worker's generator."""
+    assert _worker_generator is not None
+    _process_one(
+        _worker_generator, input_path, stat_result, output_file, validate_only, kwargs
+    )
+
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
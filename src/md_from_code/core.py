@@ -3,11 +3,14 @@ Core markdown generation functionality.
 """
 
 import os
+import stat
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set, Tuple
 from jinja2 import Environment, FileSystemLoader, Template
 
-from .registry import FileTypeRegistry
+from .registry import FileTypeInfo, FileTypeRegistry
 from .processors import CodeFileProcessor, StructuredFileProcessor
 
 
@@ -21,20 +24,29 @@ class MarkdownGenerator:
         Args:
             template_dir: Directory containing Jinja2 templates (optional)
         """
+        self.template_dir = template_dir
         self.registry = FileTypeRegistry()
         self.code_processor = CodeFileProcessor()
         self.structured_processor = StructuredFileProcessor()
 
-        # Set up template environment
+        # Set up template environment. Templates don't change during a run, so
+        # skip the per-render mtime check and keep every compiled template.
         if template_dir and template_dir.exists():
-            self.template_env = Environment(loader=FileSystemLoader(str(template_dir)))
+            loader = FileSystemLoader(str(template_dir))
         else:
             # Use built-in templates
-            template_path = Path(__file__).parent / "templates"
-            self.template_env = Environment(loader=FileSystemLoader(str(template_path)))
+            loader = FileSystemLoader(str(Path(__file__).parent / "templates"))
+        self.template_env = Environment(loader=loader, auto_reload=False, cache_size=-1)
 
         # Set up default template
         self.default_template_name = "default.md.j2"
+        self._default_template: Optional[Template] = None
+
+        # Output directories already created by generate_markdown
+        self._ensured_dirs: Set[Path] = set()
+
+        # Every file rendered by this generator shares one generation timestamp
+        self._timestamp = datetime.now().isoformat()
 
     def generate_markdown(
         self,
@@ -57,16 +69,132 @@ class MarkdownGenerator:
                 - max_lines: Maximum lines to include
                 - include_metadata: Include file metadata (default: True)
                 - include_stats: Include code/structure statistics (default: True)
+                - analyze_structure: Compute the statistics at all; pass False
+                  when the template doesn't display them (default: True)
+                - stat_result: Pre-computed os.stat_result for the file; skips
+                  the existence check and re-stat'ing in the processors
+                - raw_data: File content as bytes, used instead of reading
+                  file_path
+                - file_extension: Lowercased extension with its leading dot (or ''
+                  for none) used for type detection instead of file_path's
+                  suffix
+                - skip_mkdir: The output directory is known to exist; don't
+                  try to create it (default: False)
 
         Returns:
             Generated markdown content as string
         """
-        if not file_path.exists():
+        extension, type_info, processed_data = self._process_file(file_path, **kwargs)
+
+        # Prepare template context
+        context = self._build_template_context(
+            file_path, extension, type_info, processed_data, **kwargs
+        )
+
+        # Load and render template
+        template_name = kwargs.get('template')
+        template = None
+        if template_name:
+            try:
+                template = self.template_env.get_template(template_name)
+            except Exception:
+                # Fallback to default template
+                pass
+        if template is None:
+            template = self._get_default_template()
+
+        markdown_content = template.render(context)
+
+        # Save to file if output path specified
+        if output_path:
+            parent = output_path.parent
+            if not kwargs.get('skip_mkdir') and parent not in self._ensured_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs.add(parent)
+            output_path.write_bytes(markdown_content.encode('utf-8'))
+
+        return markdown_content
+
+    def generate_markdown_from_bytes(
+        self,
+        data: bytes,
+        ext: str,
+        output_path: Optional[Path] = None,
+        file_name: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate markdown for file content that is already in memory.
+
+        Nothing is read from disk. The metadata reports a regular file of
+        len(data) bytes modified now.
+
+        Args:
+            data: Raw file content
+            ext: File extension used for type detection, e.g. '.py', or ''
+                for files without one
+            output_path: Optional output path for saving markdown
+            file_name: File name shown in the markdown, used as given
+                (default: 'untitled' plus ext)
+            **kwargs: Same options as generate_markdown
+
+        Returns:
+            Generated markdown content as string
+        """
+        now = time.time()
+        stat_result = os.stat_result(
+            (stat.S_IFREG | 0o644, 0, 0, 1, 0, 0, len(data), now, now, now)
+        )
+        kwargs['stat_result'] = stat_result
+        kwargs['raw_data'] = data
+        ext = ext.lower()
+        if ext and not ext.startswith('.'):
+            ext = '.' + ext
+        kwargs['file_extension'] = ext
+        return self.generate_markdown(
+            Path(file_name or f'untitled{ext}'), output_path, **kwargs
+        )
+
+    def validate(self, file_path: Path, **kwargs) -> Dict[str, Any]:
+        """
+        Process a source file without rendering any markdown.
+
+        Runs only the file processor, skipping template context, frontmatter
+        and rendering, which makes it suitable for validation runs.
+
+        Args:
+            file_path: Path to the source file
+            **kwargs: Same options as generate_markdown
+
+        Returns:
+            Processed data from the file processor (see 'is_valid' and
+            'parsing_error' for structured files)
+        """
+        return self._process_file(file_path, **kwargs)[2]
+
+    def _process_file(
+        self,
+        file_path: Path,
+        **kwargs
+    ) -> Tuple[str, FileTypeInfo, Dict[str, Any]]:
+        """
+        Resolve a file's type and run the matching processor.
+
+        Returns:
+            Tuple of (lowercased extension, type_info, processed_data)
+        """
+        if kwargs.get('stat_result') is None and not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
         # Get file type information
+        extension = kwargs.get('file_extension')
+        if extension is None:
+            extension = file_path.suffix.lower()
         format_override = kwargs.get('format_override')
-        type_info = self.registry.get_type_info(file_path.suffix, format_override)
+        if format_override:
+            type_info = self.registry.get_type_info(extension, format_override)
+        else:
+            type_info = self.registry._get_type_info_normalized(extension)
 
         # Select appropriate processor
         if type_info.processor_type == 'structured':
@@ -77,51 +205,52 @@ class MarkdownGenerator:
         # Process the file
         processed_data = processor.process(file_path, **kwargs)
 
-        # Prepare template context
-        context = self._build_template_context(
-            file_path, type_info, processed_data, **kwargs
-        )
+        return extension, type_info, processed_data
 
-        # Load and render template
-        template_name = kwargs.get('template', self.default_template_name)
-        try:
-            template = self.template_env.get_template(template_name)
-        except Exception:
-            # Fallback to default template
-            template = self.template_env.get_template(self.default_template_name)
-
-        markdown_content = template.render(context)
-
-        # Save to file if output path specified
-        if output_path:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(markdown_content, encoding='utf-8')
-
-        return markdown_content
+    def _get_default_template(self) -> Template:
+        """Load the default template once and reuse it for every file."""
+        if self._default_template is None:
+            self._default_template = self.template_env.get_template(self.default_template_name)
+        return self._default_template
 
     def _build_template_context(
         self,
         file_path: Path,
+        extension: str,
         type_info,
         processed_data: Dict[str, Any],
         **kwargs
     ) -> Dict[str, Any]:
-        """Build context dictionary for template rendering."""
+        """
+        Build context dictionary for template rendering.
+
+        Args:
+            file_path: Path to the source file
+            extension: Lowercased file extension (e.g. '.py')
+            type_info: File type information for the file
+            processed_data: Output of the file processor
+            **kwargs: Generation options (see generate_markdown)
+        """
+
+        file_name = file_path.name
 
         # Base context
         context = {
             'file_path': file_path,
-            'file_name': file_path.name,
+            'file_name': file_name,
             'type_info': type_info,
             'processed_data': processed_data,
             'generation_timestamp': self._get_timestamp(),
         }
 
-        # Customizable fields
+        # Customizable fields; defaults are only generated when not supplied
         context.update({
-            'title': kwargs.get('title', self._generate_title(file_path, type_info)),
-            'description': kwargs.get('description', self._generate_description(file_path, type_info)),
-            'tags': kwargs.get('tags', self._generate_tags(file_path, type_info)),
+            'title': kwargs['title'] if 'title' in kwargs
+            else self._generate_title(file_path.stem, type_info),
+            'description': kwargs['description'] if 'description' in kwargs
+            else self._generate_description(file_name, type_info),
+            'tags': kwargs['tags'] if 'tags' in kwargs
+            else self._generate_tags(extension, type_info),
             'include_metadata': kwargs.get('include_metadata', True),
             'include_stats': kwargs.get('include_stats', True),
             'include_toc': kwargs.get('include_toc', True),
@@ -151,37 +280,35 @@ class MarkdownGenerator:
 
         return frontmatter
 
-    def _generate_title(self, file_path: Path, type_info) -> str:
-        """Generate a default title for the file."""
-        base_name = file_path.stem
+    def _generate_title(self, base_name: str, type_info) -> str:
+        """Generate a default title from the file's stem."""
         # Clean up common prefixes and make title-case
         clean_name = base_name.replace('_', ' ').replace('-', ' ')
         return f"{clean_name.title()} ({type_info.name})"
 
-    def _generate_description(self, file_path: Path, type_info) -> str:
+    def _generate_description(self, file_name: str, type_info) -> str:
         """Generate a default description for the file."""
-        return f"{type_info.description or type_info.name} - {file_path.name}"
-
-    def _generate_tags(self, file_path: Path, type_info) -> list[str]:
-        """Generate default tags for the file."""
-        tags = [type_info.name.lower()]
-
-        # Add extension-based tag
-        if file_path.suffix:
-            ext_tag = file_path.suffix[1:].lower()  # Remove dot
-            if ext_tag not in tags:
-                tags.append(ext_tag)
-
-        # Add processor type tag
-        if type_info.processor_type not in tags:
-            tags.append(type_info.processor_type)
-
-        return tags
+        return f"{type_info.description or type_info.name} - {file_name}"
+
+    def _generate_tags(self, extension: str, type_info) -> list[str]:
+        """Generate default tags for the file from its lowercased extension."""
+        # Type name, extension without the dot, and processor type; dict.fromkeys
+        # drops duplicates while keeping the order stable for the frontmatter
+        tags: Tuple[str, ...]
+        if extension:
+            tags = (type_info.name.lower(), extension[1:], type_info.processor_type)
+        else:
+            tags = (type_info.name.lower(), type_info.processor_type)
+        return list(dict.fromkeys(tags))
 
     def _get_timestamp(self) -> str:
-        """Get current timestamp for generation metadata."""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        """
+        Get the timestamp for generation metadata.
+
+        This is when the generator was created (i.e. the start of a batch
+        run), not when the individual file was rendered.
+        """
+        return self._timestamp
 
     def get_supported_formats(self) -> Dict[str, str]:
         """Get mapping of supported file extensions to format names."""
@@ -5,5 +5,6 @@ File processors for converting different file types to markdown.
 from .base import FileProcessor
 from .code import CodeFileProcessor
 from .structured import StructuredFileProcessor
+from .batch import batch_process
 
-__all__ = ["FileProcessor", "CodeFileProcessor", "StructuredFileProcessor"]
\ No newline at end of file
+__all__ = ["FileProcessor", "CodeFileProcessor", "StructuredFileProcessor", "batch_process"]
\ No newline at end of file
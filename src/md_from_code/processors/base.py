@@ -3,13 +3,39 @@ Base file processor class and common utilities.
 """
 
 import os
+import re
 import stat
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 import chardet
 
+# Count line statistics with C-level scans instead of splitting into a list;
+# set to False to fall back to the splitlines() implementation
+_FAST_COUNT = True
+
+# Matches a whitespace-only line (each empty line is a zero-width match)
+_BLANK_LINE_RE = re.compile(r'^[^\S\n]*$', re.MULTILINE)
+
+# Working directory used to build absolute paths, captured on first use
+_cwd: Optional[Path] = None
+
+
+def _absolute_path(file_path: Path) -> Path:
+    """
+    Make a path absolute against the cached working directory.
+
+    Like Path.absolute() this does not resolve symlinks, but it avoids a
+    getcwd() call for every file processed.
+    """
+    global _cwd
+    if file_path.is_absolute():
+        return file_path
+    if _cwd is None:
+        _cwd = Path.cwd()
+    return _cwd / file_path
+
 
 class FileProcessor(ABC):
     """Base class for file processors."""
@@ -31,10 +57,33 @@ class FileProcessor(ABC):
         """
         pass
 
-    def extract_metadata(self, file_path: Path) -> Dict[str, Any]:
-        """Extract file metadata."""
+    def extract_metadata(
+        self,
+        file_path: Path,
+        stat_result: Optional[os.stat_result] = None,
+        extension: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract file metadata.
+
+        ``absolute_path`` is joined onto the working directory captured when
+        the first file was processed; symlinks are not resolved.
+
+        Args:
+            file_path: Path to the file
+            stat_result: Pre-computed stat result (e.g. from file discovery)
+                to avoid stat'ing the file again
+            extension: Lowercased extension to report instead of the file's
+                own suffix
+        """
+        file_name = file_path.name
+        if extension is None:
+            extension = file_path.suffix.lower()
+        absolute_path = str(_absolute_path(file_path))
+        relative_path = str(file_path)
+
         try:
-            file_stat = file_path.stat()
+            file_stat = stat_result or file_path.stat()
 
             # Get file permissions
             permissions = stat.filemode(file_stat.st_mode)
@@ -44,7 +93,7 @@ class FileProcessor(ABC):
             modified_time = datetime.fromtimestamp(file_stat.st_mtime)
 
             return {
-                "file_name": file_path.name,
+                "file_name": file_name,
                 "file_size": file_stat.st_size,
                 "file_size_human": self._format_file_size(file_stat.st_size),
                 "permissions": permissions,
@@ -52,72 +101,157 @@ class FileProcessor(ABC):
                 "modified": modified_time.isoformat(),
                 "created_human": created_time.strftime("%Y-%m-%d %H:%M:%S"),
                 "modified_human": modified_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "extension": file_path.suffix.lower(),
-                "absolute_path": str(file_path.absolute()),
-                "relative_path": str(file_path),
+                "extension": extension,
+                "absolute_path": absolute_path,
+                "relative_path": relative_path,
                 "parent_dir": file_path.parent.name,
             }
         except (OSError, IOError) as e:
             return {
-                "file_name": file_path.name,
+                "file_name": file_name,
                 "error": f"Could not extract metadata: {str(e)}",
                 "file_size": 0,
                 "file_size_human": "Unknown",
-                "extension": file_path.suffix.lower(),
-                "absolute_path": str(file_path.absolute()),
-                "relative_path": str(file_path),
+                "extension": extension,
+                "absolute_path": absolute_path,
+                "relative_path": relative_path,
             }
 
-    def read_file_content(self, file_path: Path, encoding: Optional[str] = None) -> tuple[str, str]:
+    def read_file_bytes(
+        self,
+        file_path: Path,
+        stat_result: Optional[os.stat_result] = None,
+        raw_data: Optional[bytes] = None
+    ) -> bytes:
         """
-        Read file content with encoding detection.
+        Read raw file content after checking the file size limit.
+
+        Args:
+            file_path: Path to the file
+            stat_result: Pre-computed stat result used for the size check
+            raw_data: File content already in memory; returned (after the
+                size check) instead of reading file_path
 
         Returns:
-            Tuple of (content, detected_encoding)
+            File content as bytes
         """
+        if raw_data is not None:
+            self._check_file_size(len(raw_data))
+            return raw_data
+
         # Check file size
         try:
-            file_size = file_path.stat().st_size
-            if file_size > self.max_file_size:
-                raise ValueError(
-                    f"File size ({self._format_file_size(file_size)}) exceeds "
-                    f"maximum allowed size ({self._format_file_size(self.max_file_size)})"
-                )
+            self._check_file_size((stat_result or file_path.stat()).st_size)
         except OSError as e:
             raise IOError(f"Cannot access file: {str(e)}")
 
-        # Detect encoding if not provided
-        detected_encoding = encoding
-        if not detected_encoding:
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except (OSError, IOError) as e:
+            raise IOError(f"Cannot read file content: {str(e)}")
+
+    def _check_file_size(self, file_size: int) -> None:
+        """Raise ValueError if a file is larger than max_file_size."""
+        if file_size > self.max_file_size:
+            raise ValueError(
+                f"File size ({self._format_file_size(file_size)}) exceeds "
+                f"maximum allowed size ({self._format_file_size(self.max_file_size)})"
+            )
+
+    def read_file_content(
+        self,
+        file_path: Path,
+        encoding: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+        raw_data: Optional[bytes] = None
+    ) -> tuple[str, str]:
+        """
+        Read file content with encoding detection.
+
+        Args:
+            file_path: Path to the file
+            encoding: Encoding override; detected when not provided
+            stat_result: Pre-computed stat result used for the size check
+            raw_data: File content already in memory, used instead of reading
+                file_path
+
+        Returns:
+            Tuple of (content, detected_encoding)
+        """
+        raw_data = self.read_file_bytes(file_path, stat_result, raw_data)
+        return self.decode_content(raw_data, encoding)
+
+    def decode_content(self, raw_data: bytes, encoding: Optional[str] = None) -> tuple[str, str]:
+        """
+        Decode raw file content with encoding detection.
+
+        Args:
+            raw_data: Raw file content
+            encoding: Encoding override; detected when not provided
+
+        Returns:
+            Tuple of (content, detected_encoding)
+        """
+        content = None
+
+        # Most files are ASCII or UTF-8, and a strict decode rejects anything
+        # else, so try that before paying for encoding detection
+        if not encoding:
             try:
-                with open(file_path, 'rb') as f:
-                    raw_data = f.read(min(8192, file_size))  # Read up to 8KB for detection
-                result = chardet.detect(raw_data)
+                content = raw_data.decode('utf-8-sig')
+                detected = 'utf-8'
+            except UnicodeDecodeError:
+                pass
+
+        if content is None:
+            # Detect encoding if not provided
+            detected_encoding = encoding
+            if not detected_encoding:
+                result = chardet.detect(raw_data[:8192])  # Up to 8KB for detection
                 detected_encoding = result.get('encoding', 'utf-8')
                 if not detected_encoding:
                     detected_encoding = 'utf-8'
-            except (OSError, IOError):
-                detected_encoding = 'utf-8'
 
-        # Read file content
-        try:
-            with open(file_path, 'r', encoding=detected_encoding, errors='replace') as f:
-                content = f.read()
-            return content, detected_encoding
-        except UnicodeDecodeError:
-            # Fallback to utf-8 with error replacement
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-                return content, 'utf-8 (with errors replaced)'
-            except (OSError, IOError) as e:
-                raise IOError(f"Cannot read file content: {str(e)}")
-
-    def count_lines(self, content: str) -> Dict[str, int]:
-        """Count various line statistics."""
-        lines = content.splitlines()
-        total_lines = len(lines)
-        blank_lines = sum(1 for line in lines if not line.strip())
+                content = raw_data.decode(detected_encoding, errors='replace')
+                detected = detected_encoding
+            except UnicodeDecodeError:
+                # Fallback to utf-8 with error replacement
+                content = raw_data.decode('utf-8', errors='replace')
+                detected = 'utf-8 (with errors replaced)'
+
+        # Match text-mode reading, which translates \r\n and \r to \n
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content, detected
+
+    def count_lines(self, content: Union[str, List[str]]) -> Dict[str, int]:
+        """
+        Count various line statistics.
+
+        Args:
+            content: File content, or its lines if the caller has already
+                split it (avoids splitting a second time)
+        """
+        if isinstance(content, list):
+            lines = content
+            total_lines = len(lines)
+            blank_lines = sum(1 for line in lines if not line.strip())
+        elif not content:
+            total_lines = blank_lines = 0
+        elif _FAST_COUNT:
+            total_lines = content.count('\n')
+            blank_lines = len(_BLANK_LINE_RE.findall(content))
+            if content.endswith('\n'):
+                # The position after the final newline is not a line of its own
+                blank_lines -= 1
+            else:
+                total_lines += 1
+        else:
+            lines = content.splitlines()
+            total_lines = len(lines)
+            blank_lines = sum(1 for line in lines if not line.strip())
         non_blank_lines = total_lines - blank_lines
 
         return {
@@ -139,6 +273,10 @@ class FileProcessor(ABC):
         # Escape backticks and other markdown special characters within code blocks
         # This is handled by the template, but we can do basic sanitization here
 
+        # Most files have no triple backticks; skip the copying replace
+        if '```' not in content:
+            return content
+
         # Replace any existing triple backticks to prevent markdown injection
         content = content.replace('```', '``\\`')
 
@@ -154,8 +292,15 @@ class FileProcessor(ABC):
         if max_lines is None:
             return content, False
 
-        lines = content.splitlines()
-        if len(lines) <= max_lines:
+        if max_lines < 0:
+            lines = content.splitlines()
+            if len(lines) <= max_lines:
+                return content, False
+            return '\n'.join(lines[:max_lines]), True
+
+        # Only split off the lines we keep; the rest stays in one remainder
+        lines = content.split('\n', max_lines)
+        if len(lines) <= max_lines or not lines[max_lines]:
             return content, False
 
         truncated_content = '\n'.join(lines[:max_lines])
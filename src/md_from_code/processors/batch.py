@@ -0,0 +1,84 @@
+"""
+Batch processing of many files across worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from .base import FileProcessor
+from .code import CodeFileProcessor
+from .structured import StructuredFileProcessor
+
+_PROCESSOR_CLASSES: Dict[str, Type[FileProcessor]] = {
+    'code': CodeFileProcessor,
+    'structured': StructuredFileProcessor,
+}
+
+
+def batch_process(
+    paths: Iterable[Path],
+    kind: str,
+    n_workers: Optional[int] = None,
+    max_file_size: int = 10 * 1024 * 1024,
+    **kwargs: Any
+) -> Iterator[Dict[str, Any]]:
+    """
+    Process files in parallel with one processor type.
+
+    Files are independent, so the CPU-bound parsing and scanning scale with
+    the number of worker processes.
+
+    Args:
+        paths: Files to process
+        kind: Processor type, 'code' or 'structured'
+        n_workers: Number of worker processes (default: CPU count); 1 processes
+            the files in the current process
+        max_file_size: Maximum file size in bytes for each processor
+        **kwargs: Options passed through to the processor's process()
+
+    Returns:
+        Iterator over the processed data for each file, in the order of paths
+
+    Raises:
+        ValueError: If kind is not a known processor type; raised by the
+            call itself, before any iteration
+    """
+    if kind not in _PROCESSOR_CLASSES:
+        raise ValueError(
+            f"Unknown processor type '{kind}' (expected one of: {', '.join(_PROCESSOR_CLASSES)})"
+        )
+
+    n_workers = n_workers or os.cpu_count() or 1
+    return _iter_processed(list(paths), kind, n_workers, max_file_size, kwargs)
+
+
+def _iter_processed(
+    paths: List[Path],
+    kind: str,
+    n_workers: int,
+    max_file_size: int,
+    kwargs: Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+    """Generator behind batch_process, once the arguments are validated."""
+    if n_workers == 1 or len(paths) < 2:
+        processor = _PROCESSOR_CLASSES[kind](max_file_size)
+        for file_path in paths:
+            yield processor.process(file_path, **kwargs)
+        return
+
+    # Hand out several small files per task to keep IPC overhead down
+    chunksize = max(1, len(paths) // (n_workers * 4))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        yield from executor.map(
+            _process_in_worker,
+            [(kind, file_path, max_file_size, kwargs) for file_path in paths],
+            chunksize=chunksize,
+        )
+
+
+def _process_in_worker(task: Tuple[str, Path, int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Pool entry point: process one file with a fresh processor."""
+    kind, file_path, max_file_size, kwargs = task
+    return _PROCESSOR_CLASSES[kind](max_file_size).process(file_path, **kwargs)
@@ -3,12 +3,186 @@ Code file processor for programming languages and scripts.
 """
 
 import re
+import sys
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Pattern
 
 from .base import FileProcessor
 
 
+# Per-language patterns. Pattern tuples are matched against stripped lines and
+# are folded into a single compiled 'structure_pattern' per language below,
+# after which the table is frozen.
+_LANGUAGE_PATTERNS: Mapping[str, Mapping[str, Any]] = {
+    '.py': {
+        'single_line_comment': ('#',),
+        'block_comments': (('"""', '"""'), ("'''", "'''")),
+        'import_patterns': (r'^(import\s+\w+|from\s+\w+\s+import)',),
+        'function_patterns': (r'^def\s+\w+\s*\(',),
+        'class_patterns': (r'^class\s+\w+',),
+    },
+    '.java': {
+        'single_line_comment': ('//',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (r'^import\s+[\w.]+;',),
+        'function_patterns': (
+            r'^\s*(public|private|protected)?\s*(static\s+)?\w+\s+\w+\s*\(',
+        ),
+        'class_patterns': (r'^(public\s+)?(abstract\s+)?class\s+\w+',),
+    },
+    '.js': {
+        'single_line_comment': ('//',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (r'^(import\s+.*from|const\s+.*=\s*require)',),
+        'function_patterns': (
+            r'^(function\s+\w+|const\s+\w+\s*=.*=>|\w+\s*:\s*function)',
+        ),
+        'class_patterns': (r'^class\s+\w+',),
+    },
+    '.ts': {
+        'single_line_comment': ('//',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (r'^import\s+.*from',),
+        'function_patterns': (
+            r'^(function\s+\w+|const\s+\w+\s*=.*=>|\w+\s*:\s*\(.*\)\s*=>)',
+        ),
+        'class_patterns': (r'^(export\s+)?(abstract\s+)?class\s+\w+',),
+    },
+    '.c': {
+        'single_line_comment': ('//',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (r'^#include\s*[<"]',),
+        'function_patterns': (r'^\w+\s+\w+\s*\(.*\)\s*{?$',),
+        'class_patterns': (),  # C doesn't have classes
+    },
+    '.cpp': {
+        'single_line_comment': ('//',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (r'^#include\s*[<"]',),
+        'function_patterns': (r'^\w+\s+\w+\s*\(.*\)\s*{?$',),
+        'class_patterns': (r'^class\s+\w+',),
+    },
+    '.go': {
+        'single_line_comment': ('//',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (r'^import\s+[(".]',),
+        'function_patterns': (r'^func\s+(\w+\s+)?\w+\s*\(',),
+        'class_patterns': (r'^type\s+\w+\s+struct',),
+    },
+    '.rs': {
+        'single_line_comment': ('//',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (r'^use\s+[\w:]+',),
+        'function_patterns': (r'^(pub\s+)?fn\s+\w+',),
+        'class_patterns': (r'^(pub\s+)?struct\s+\w+',),
+    },
+    '.sh': {
+        'single_line_comment': ('#',),
+        'import_patterns': (r'^(source\s+|\.?\s+)',),
+        'function_patterns': (r'^\w+\s*\(\s*\)\s*{',),
+        'class_patterns': (),
+    },
+    '.sql': {
+        'single_line_comment': ('--',),
+        'block_comments': (('/*', '*/'),),
+        'import_patterns': (),
+        'function_patterns': (r'^(CREATE\s+)?(FUNCTION|PROCEDURE)\s+\w+',),
+        'class_patterns': (),  # SQL doesn't have classes
+    },
+}
+
+# Patterns for extensions without a dedicated entry
+_DEFAULT_PATTERNS: Mapping[str, Any] = {
+    'single_line_comment': ('#', '//', '--'),
+    'import_patterns': (),
+    'function_patterns': (),
+    'class_patterns': (),
+}
+
+# Structure statistic counted for each kind of pattern, in match priority order
+_STRUCTURE_STATS = (
+    ('import_patterns', 'import_statements'),
+    ('function_patterns', 'function_definitions'),
+    ('class_patterns', 'class_definitions'),
+)
+
+
+def _compile_structure_pattern(patterns: Mapping[str, Any]) -> Optional[Pattern[str]]:
+    """
+    Combine a language's import/function/class patterns into one regex.
+
+    Each kind becomes a named group (named after the statistic it feeds), so
+    a single match per line both detects and classifies it via lastgroup.
+    Earlier kinds win when a line matches more than one.
+    """
+    alternatives = [
+        f"(?P<{stat_name}>{'|'.join(f'(?:{p})' for p in patterns[key])})"
+        for key, stat_name in _STRUCTURE_STATS
+        if patterns.get(key)
+    ]
+    return re.compile('|'.join(alternatives)) if alternatives else None
+
+
+def _compile_line_scan_pattern(
+    patterns: Mapping[str, Any],
+    structure_pattern: Optional[Pattern[str]]
+) -> Pattern[str]:
+    """
+    Build a multiline regex classifying every line of stripped content.
+
+    Single-line comments come first so commented-out code is never counted
+    as structure. Whitespace classes are kept from crossing line breaks so
+    each match stays within one line, as when matching stripped lines.
+    """
+    alternatives = []
+    if patterns.get('single_line_comment'):
+        prefixes = '|'.join(re.escape(c) for c in patterns['single_line_comment'])
+        alternatives.append(f'(?P<comment_lines>^(?:{prefixes}))')
+    if structure_pattern is not None:
+        alternatives.append(structure_pattern.pattern.replace(r'\s', r'[^\S\n]'))
+    return re.compile('|'.join(alternatives) or '(?!)', re.MULTILINE)
+
+
+def _compile_block_comment_pattern(patterns: Mapping[str, Any]) -> Optional[Pattern[str]]:
+    """
+    Build a regex matching whole block comments across lines.
+
+    A comment left open runs to the end of the content.
+    """
+    delimiters = patterns.get('block_comments')
+    if not delimiters:
+        return None
+    return re.compile(
+        '|'.join(f'{re.escape(start)}.*?(?:{re.escape(end)}|\\Z)' for start, end in delimiters),
+        re.DOTALL
+    )
+
+
+def _freeze_patterns(patterns: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Add a language's compiled regexes and return it as a read-only mapping."""
+    structure_pattern = _compile_structure_pattern(patterns)
+    return MappingProxyType({
+        **patterns,
+        'structure_pattern': structure_pattern,
+        'block_comment_pattern': _compile_block_comment_pattern(patterns),
+        'line_scan_pattern': _compile_line_scan_pattern(patterns, structure_pattern),
+    })
+
+
+_LANGUAGE_PATTERNS = MappingProxyType({
+    sys.intern(extension): _freeze_patterns(patterns)
+    for extension, patterns in _LANGUAGE_PATTERNS.items()
+})
+_DEFAULT_PATTERNS = _freeze_patterns(_DEFAULT_PATTERNS)
+
+# Leading/trailing whitespace on each line
+_LINE_STRIP_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+
+# Start of a line with some non-whitespace content
+_NON_BLANK_LINE_RE = re.compile(r'^[^\S\n]*\S', re.MULTILINE)
+
+
 class CodeFileProcessor(FileProcessor):
     """Processor for programming language files."""
 
@@ -22,17 +196,22 @@ class CodeFileProcessor(FileProcessor):
                 - max_lines: Maximum lines to include
                 - include_line_numbers: Whether to include line numbers
                 - encoding: File encoding override
+                - stat_result: Pre-computed os.stat_result for the file
+                - raw_data: File content as bytes, used instead of reading the file
+                - file_extension: Lowercased extension used instead of the file's suffix
+                - analyze_structure: Compute language_stats (default: True)
 
         Returns:
             Dictionary with processed content and metadata
         """
         # Extract basic metadata
-        metadata = self.extract_metadata(file_path)
+        stat_result = kwargs.get('stat_result')
+        metadata = self.extract_metadata(file_path, stat_result, kwargs.get('file_extension'))
 
         # Read file content
         try:
             content, detected_encoding = self.read_file_content(
-                file_path, kwargs.get('encoding')
+                file_path, kwargs.get('encoding'), stat_result, kwargs.get('raw_data')
             )
         except (IOError, ValueError) as e:
             return {
@@ -56,7 +235,11 @@ class CodeFileProcessor(FileProcessor):
         line_stats = self.count_lines(content)
 
         # Extract language-specific information
-        language_stats = self._analyze_code_structure(content, file_path.suffix)
+        language_stats = {}
+        if kwargs.get('analyze_structure', True):
+            language_stats = self._analyze_code_structure(
+                content, metadata['extension'], line_stats['non_blank_lines']
+            )
 
         return {
             **metadata,
@@ -70,9 +253,24 @@ class CodeFileProcessor(FileProcessor):
             'truncated_at_line': max_lines if was_truncated else None,
         }
 
-    def _analyze_code_structure(self, content: str, extension: str) -> Dict[str, Any]:
-        """Analyze code structure for language-specific insights."""
-        lines = content.splitlines()
+    def _analyze_code_structure(
+        self,
+        content: str,
+        extension: str,
+        non_blank_lines: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze code structure for language-specific insights.
+
+        Args:
+            content: File content
+            extension: Lowercased file extension (e.g. '.py')
+            non_blank_lines: Non-blank line count if the caller already has
+                line statistics; computed from content otherwise
+        """
+        if non_blank_lines is None:
+            non_blank_lines = self.count_lines(content)['non_blank_lines']
+
         stats = {
             'comment_lines': 0,
             'import_statements': 0,
@@ -82,171 +280,82 @@ class CodeFileProcessor(FileProcessor):
         }
 
         # Define patterns based on file extension
-        patterns = self._get_language_patterns(extension.lower())
-
-        # Count occurrences
-        in_multiline_comment = False
-        multiline_comment_start = patterns.get('multiline_comment_start')
-        multiline_comment_end = patterns.get('multiline_comment_end')
-
-        for line in lines:
-            stripped_line = line.strip()
-            if not stripped_line:
-                continue
-
-            # Handle multiline comments
-            if multiline_comment_start and multiline_comment_end:
-                if multiline_comment_start in stripped_line:
-                    in_multiline_comment = True
-                if in_multiline_comment:
-                    stats['comment_lines'] += 1
-                if multiline_comment_end in stripped_line:
-                    in_multiline_comment = False
-                    continue
-
-            if in_multiline_comment:
-                continue
-
-            # Single line comments
-            if patterns.get('single_line_comment') and any(
-                stripped_line.startswith(comment)
-                for comment in patterns['single_line_comment']
-            ):
-                stats['comment_lines'] += 1
-                continue
+        patterns = self._get_language_patterns(extension)
+
+        # Count occurrences. Lines touched by a block comment count as
+        # comments and are left out of the line classification.
+        code_content = content
+        if patterns['block_comment_pattern'] is not None:
+            code_content = self._strip_block_comments(
+                content, patterns['block_comment_pattern'], stats
+            )
+        self._count_by_scan(code_content, patterns, stats)
 
-            # Import statements
-            if patterns.get('import_patterns'):
-                for pattern in patterns['import_patterns']:
-                    if re.match(pattern, stripped_line):
-                        stats['import_statements'] += 1
-                        break
-
-            # Function definitions
-            if patterns.get('function_patterns'):
-                for pattern in patterns['function_patterns']:
-                    if re.match(pattern, stripped_line):
-                        stats['function_definitions'] += 1
-                        break
-
-            # Class definitions
-            if patterns.get('class_patterns'):
-                for pattern in patterns['class_patterns']:
-                    if re.match(pattern, stripped_line):
-                        stats['class_definitions'] += 1
-                        break
-
-            # Docstrings (Python-specific for now)
-            if extension.lower() == '.py' and ('"""' in stripped_line or "'''" in stripped_line):
-                stats['docstring_blocks'] += 1
+        # Docstrings (Python-specific for now): each block has an opening
+        # and a closing triple quote
+        if extension == '.py':
+            stats['docstring_blocks'] = content.count('"""') // 2 + content.count("'''") // 2
 
         # Calculate percentages
-        total_content_lines = stats['comment_lines'] + len([
-            line for line in lines
-            if line.strip() and not self._is_comment_line(line.strip(), patterns)
-        ])
-
-        if total_content_lines > 0:
-            stats['comment_percentage'] = round((stats['comment_lines'] / total_content_lines) * 100, 1)
+        if non_blank_lines > 0:
+            stats['comment_percentage'] = round((stats['comment_lines'] / non_blank_lines) * 100, 1)
         else:
             stats['comment_percentage'] = 0.0
 
         return stats
 
-    def _get_language_patterns(self, extension: str) -> Dict[str, Any]:
-        """Get regex patterns for different programming languages."""
+    def _strip_block_comments(
+        self,
+        content: str,
+        block_comment_pattern: Pattern[str],
+        stats: Dict[str, Any]
+    ) -> str:
+        """
+        Count the lines covered by block comments and remove them.
 
-        patterns_map = {
-            '.py': {
-                'single_line_comment': ['#'],
-                'multiline_comment_start': '"""',
-                'multiline_comment_end': '"""',
-                'import_patterns': [r'^(import\s+\w+|from\s+\w+\s+import)'],
-                'function_patterns': [r'^def\s+\w+\s*\('],
-                'class_patterns': [r'^class\s+\w+'],
-            },
-            '.java': {
-                'single_line_comment': ['//'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [r'^import\s+[\w.]+;'],
-                'function_patterns': [r'^\s*(public|private|protected)?\s*(static\s+)?\w+\s+\w+\s*\('],
-                'class_patterns': [r'^(public\s+)?(abstract\s+)?class\s+\w+'],
-            },
-            '.js': {
-                'single_line_comment': ['//'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [r'^(import\s+.*from|const\s+.*=\s*require)'],
-                'function_patterns': [r'^(function\s+\w+|const\s+\w+\s*=.*=>|\w+\s*:\s*function)'],
-                'class_patterns': [r'^class\s+\w+'],
-            },
-            '.ts': {
-                'single_line_comment': ['//'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [r'^import\s+.*from'],
-                'function_patterns': [r'^(function\s+\w+|const\s+\w+\s*=.*=>|\w+\s*:\s*\(.*\)\s*=>)'],
-                'class_patterns': [r'^(export\s+)?(abstract\s+)?class\s+\w+'],
-            },
-            '.c': {
-                'single_line_comment': ['//'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [r'^#include\s*[<"]'],
-                'function_patterns': [r'^\w+\s+\w+\s*\(.*\)\s*{?$'],
-                'class_patterns': [],  # C doesn't have classes
-            },
-            '.cpp': {
-                'single_line_comment': ['//'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [r'^#include\s*[<"]'],
-                'function_patterns': [r'^\w+\s+\w+\s*\(.*\)\s*{?$'],
-                'class_patterns': [r'^class\s+\w+'],
-            },
-            '.go': {
-                'single_line_comment': ['//'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [r'^import\s+[(".]'],
-                'function_patterns': [r'^func\s+(\w+\s+)?\w+\s*\('],
-                'class_patterns': [r'^type\s+\w+\s+struct'],
-            },
-            '.rs': {
-                'single_line_comment': ['//'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [r'^use\s+[\w:]+'],
-                'function_patterns': [r'^(pub\s+)?fn\s+\w+'],
-                'class_patterns': [r'^(pub\s+)?struct\s+\w+'],
-            },
-            '.sh': {
-                'single_line_comment': ['#'],
-                'import_patterns': [r'^(source\s+|\.?\s+)'],
-                'function_patterns': [r'^\w+\s*\(\s*\)\s*{'],
-                'class_patterns': [],
-            },
-            '.sql': {
-                'single_line_comment': ['--'],
-                'multiline_comment_start': '/*',
-                'multiline_comment_end': '*/',
-                'import_patterns': [],
-                'function_patterns': [r'^(CREATE\s+)?(FUNCTION|PROCEDURE)\s+\w+'],
-                'class_patterns': [],  # SQL doesn't have classes
-            },
-        }
+        Block comments are found with one regex scan over the whole content
+        rather than by tracking state line by line, which also handles
+        comments that open and close on the same line.
 
-        return patterns_map.get(extension, {
-            'single_line_comment': ['#', '//', '--'],
-            'import_patterns': [],
-            'function_patterns': [],
-            'class_patterns': [],
-        })
+        Returns:
+            Content with every line touched by a block comment removed
+        """
+        pieces = []
+        position = 0  # Start of the content not yet consumed
+        for match in block_comment_pattern.finditer(content):
+            line_start = max(content.rfind('\n', 0, match.start()) + 1, position)
+            line_end = content.find('\n', match.end())
+            line_end = len(content) if line_end == -1 else line_end + 1
+            if line_end <= line_start:
+                # Entirely on a line an earlier comment already covered
+                continue
+            stats['comment_lines'] += len(
+                _NON_BLANK_LINE_RE.findall(content, line_start, line_end)
+            )
+            pieces.append(content[position:line_start])
+            position = line_end
+        pieces.append(content[position:])
+        return ''.join(pieces)
+
+    def _count_by_scan(
+        self,
+        content: str,
+        patterns: Mapping[str, Any],
+        stats: Dict[str, Any]
+    ) -> None:
+        """
+        Count comment and structure lines with whole-content regex scans.
 
-    def _is_comment_line(self, line: str, patterns: Dict[str, Any]) -> bool:
-        """Check if a line is a comment."""
-        if not patterns.get('single_line_comment'):
-            return False
+        Expects block comments to have been removed, so that every line can
+        be classified on its own. Lines are stripped with one regex substitution,
+        then a single multiline scan classifies each line as a comment or a
+        structure statement, so the work happens in the regex engine rather
+        than in a Python loop per line.
+        """
+        stripped_content = _LINE_STRIP_RE.sub('', content)
+        for match in patterns['line_scan_pattern'].finditer(stripped_content):
+            stats[match.lastgroup] += 1
 
-        return any(line.startswith(comment) for comment in patterns['single_line_comment'])
\ No newline at end of file
+    def _get_language_patterns(self, extension: str) -> Mapping[str, Any]:
+        """Get regex patterns for different programming languages."""
+        return _LANGUAGE_PATTERNS.get(extension, _DEFAULT_PATTERNS)
@@ -2,18 +2,71 @@
 Structured file processor for JSON, XML, YAML, and other data formats.
 """
 
+import codecs
 import json
+import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 import yaml
 
 from .base import FileProcessor
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson turns integers wider than 64 bits into floats, so documents with
+# long digit runs go through the stdlib parser instead
+_LONG_DIGITS_RE = re.compile(r'\d{19}')
+
+# Prefer the libyaml bindings for parsing when PyYAML was built with them.
+# Output is always dumped by the pure-Python dumper, since libyaml wraps long
+# scalars differently
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Handler method names by extension, bound on each instance so that
+# subclasses can override individual handlers
+_TYPE_HANDLERS = {
+    '.json': '_process_json',
+    '.slp': '_process_json',  # SnapLogic pipelines are JSON
+    '.xml': '_process_xml',
+    '.yaml': '_process_yaml',
+    '.yml': '_process_yaml',
+    '.toml': '_process_toml',
+    '.ini': '_process_ini_like',
+    '.cfg': '_process_ini_like',
+    '.conf': '_process_ini_like',
+    '.properties': '_process_ini_like',
+}
+
+_JSON_TYPE_MAP = {
+    dict: 'object',
+    list: 'array',
+    str: 'string',
+    int: 'number',
+    float: 'number',
+    bool: 'boolean',
+    type(None): 'null',
+}
+
 
 class StructuredFileProcessor(FileProcessor):
     """Processor for structured data files like JSON, XML, YAML."""
 
+    # Nesting levels inspected when measuring depth; deeper data is reported
+    # at this depth rather than walked further
+    max_analysis_depth = 64
+
+    def __init__(self, max_file_size: int = 10 * 1024 * 1024):
+        super().__init__(max_file_size)
+        # Bound handler per extension, for _process_by_type
+        self._handlers: Dict[str, Callable[..., Dict[str, Any]]] = {
+            extension: getattr(self, handler_name)
+            for extension, handler_name in _TYPE_HANDLERS.items()
+        }
+
     def process(self, file_path: Path, **kwargs) -> Dict[str, Any]:
         """
         Process a structured data file.
@@ -23,20 +76,27 @@ class StructuredFileProcessor(FileProcessor):
             **kwargs: Processing options including:
                 - max_lines: Maximum lines to include
                 - indent: Indentation for pretty-printing (default: 2)
+                - sort_keys: Sort JSON object keys when pretty-printing
+                - preserve_formatting: Keep YAML as written instead of re-dumping it
+                - analyze_structure: Compute structure_info (default: True)
                 - encoding: File encoding override
+                - stat_result: Pre-computed os.stat_result for the file
+                - raw_data: File content as bytes, used instead of reading the file
+                - file_extension: Lowercased extension used instead of the file's suffix
                 - validate_structure: Whether to validate file structure
 
         Returns:
             Dictionary with processed content and metadata
         """
         # Extract basic metadata
-        metadata = self.extract_metadata(file_path)
+        stat_result = kwargs.get('stat_result')
+        metadata = self.extract_metadata(file_path, stat_result, kwargs.get('file_extension'))
 
         # Read file content
+        extension = metadata['extension']
         try:
-            content, detected_encoding = self.read_file_content(
-                file_path, kwargs.get('encoding')
-            )
+            raw_data = self.read_file_bytes(file_path, stat_result, kwargs.get('raw_data'))
+            content, detected_encoding = self.decode_content(raw_data, kwargs.get('encoding'))
         except (IOError, ValueError) as e:
             return {
                 **metadata,
@@ -49,10 +109,16 @@ class StructuredFileProcessor(FileProcessor):
                 'is_valid': False
             }
 
+        # The C parsers can take well-formed UTF-8 bytes directly, which
+        # spares them from re-encoding the decoded text
+        utf8_data = None
+        if (detected_encoding == 'utf-8' and not raw_data.startswith(codecs.BOM_UTF8)
+                and '\ufffd' not in content):
+            utf8_data = raw_data
+
         # Process based on file type
-        extension = file_path.suffix.lower()
         processed_result = self._process_by_type(
-            content, extension, kwargs.get('indent', 2)
+            content, extension, utf8_data=utf8_data, **kwargs
         )
 
         # Truncate if needed
@@ -78,34 +144,60 @@ class StructuredFileProcessor(FileProcessor):
             'parsing_error': processed_result.get('parsing_error'),
         }
 
-    def _process_by_type(self, content: str, extension: str, indent: int) -> Dict[str, Any]:
+    def _process_by_type(self, content: str, extension: str, **kwargs) -> Dict[str, Any]:
         """Process content based on its type."""
+        # Unknown extensions fall back to plain text with structure detection
+        handler: Callable[..., Dict[str, Any]] = self._handlers.get(
+            extension, self._process_unknown_structured
+        )
+        return handler(content, **kwargs)
 
-        if extension in ['.json', '.slp']:  # Include .slp as JSON
-            return self._process_json(content, indent)
-        elif extension in ['.xml']:
-            return self._process_xml(content, indent)
-        elif extension in ['.yaml', '.yml']:
-            return self._process_yaml(content, indent)
-        elif extension in ['.toml']:
-            return self._process_toml(content)
-        elif extension in ['.ini', '.cfg', '.conf', '.properties']:
-            return self._process_ini_like(content)
-        else:
-            # Fallback: treat as plain text but try to detect structure
-            return self._process_unknown_structured(content)
+    def _process_json(self, content: str, **kwargs) -> Dict[str, Any]:
+        """
+        Process JSON content with pretty-printing and validation.
 
-    def _process_json(self, content: str, indent: int) -> Dict[str, Any]:
-        """Process JSON content with pretty-printing and validation."""
+        Parsing uses orjson when available, but output always comes from the
+        stdlib encoder so it doesn't depend on the installed backend (orjson
+        formats floats differently, e.g. 1e100 instead of 1e+100). When
+        max_lines is set, encoding stops shortly after that many lines have
+        been produced; the caller truncates the rest anyway.
+        """
+        indent = kwargs.get('indent', 2)
+        max_lines = kwargs.get('max_lines')
+        sort_keys = kwargs.get('sort_keys', False)
         try:
-            # Parse JSON
-            parsed_data = json.loads(content)
+            # Parse JSON, preferring orjson. The stdlib parser is the fallback
+            # since it also accepts NaN/Infinity and keeps big integers exact
+            fast_parsed = False
+            if orjson is not None and not _LONG_DIGITS_RE.search(content):
+                try:
+                    parsed_data = orjson.loads(kwargs.get('utf8_data') or content)
+                    fast_parsed = True
+                except orjson.JSONDecodeError:
+                    pass
+            if not fast_parsed:
+                parsed_data = json.loads(content)
 
             # Pretty-print with specified indentation
-            pretty_content = json.dumps(parsed_data, indent=indent, ensure_ascii=False, sort_keys=True)
+            encoder = json.JSONEncoder(indent=indent, ensure_ascii=False, sort_keys=sort_keys)
+            if max_lines is None or max_lines < 0:
+                pretty_content = encoder.encode(parsed_data)
+            else:
+                chunks = []
+                line_breaks = 0
+                for chunk in encoder.iterencode(parsed_data):
+                    chunks.append(chunk)
+                    line_breaks += chunk.count('\n')
+                    # One line past the limit keeps truncation detectable
+                    if line_breaks > max_lines:
+                        break
+                pretty_content = ''.join(chunks)
 
             # Analyze structure
-            structure_info = self._analyze_json_structure(parsed_data)
+            structure_info = (
+                self._analyze_json_structure(parsed_data)
+                if kwargs.get('analyze_structure', True) else {}
+            )
 
             return {
                 'content': pretty_content,
@@ -121,14 +213,15 @@ class StructuredFileProcessor(FileProcessor):
                 'parsing_error': f"JSON parsing error at line {e.lineno}, column {e.colno}: {e.msg}"
             }
 
-    def _process_xml(self, content: str, indent: int) -> Dict[str, Any]:
+    def _process_xml(self, content: str, **kwargs) -> Dict[str, Any]:
         """Process XML content with pretty-printing and validation."""
+        indent = kwargs.get('indent', 2)
         try:
             # Parse XML
             root = ET.fromstring(content)
 
             # Pretty-print XML
-            self._indent_xml(root, 0, ' ' * indent)
+            ET.indent(root, space=' ' * indent)
             pretty_content = ET.tostring(root, encoding='unicode', method='xml')
 
             # Add XML declaration if not present
@@ -136,7 +229,10 @@ class StructuredFileProcessor(FileProcessor):
                 pretty_content = '<?xml version="1.0" encoding="UTF-8"?>\n' + pretty_content
 
             # Analyze structure
-            structure_info = self._analyze_xml_structure(root)
+            structure_info = (
+                self._analyze_xml_structure(root)
+                if kwargs.get('analyze_structure', True) else {}
+            )
 
             return {
                 'content': pretty_content,
@@ -152,23 +248,42 @@ class StructuredFileProcessor(FileProcessor):
                 'parsing_error': f"XML parsing error: {str(e)}"
             }
 
-    def _process_yaml(self, content: str, indent: int) -> Dict[str, Any]:
-        """Process YAML content with validation."""
+    def _process_yaml(self, content: str, **kwargs) -> Dict[str, Any]:
+        """
+        Process YAML content with validation.
+
+        The documents are re-dumped with sorted keys unless preserve_formatting
+        is set, in which case the original content is kept as-is.
+        """
+        indent = kwargs.get('indent', 2)
+        max_lines = kwargs.get('max_lines')
         try:
             # Parse YAML (can handle multiple documents)
-            parsed_data = list(yaml.safe_load_all(content))
+            parsed_data = list(yaml.load_all(
+                kwargs.get('utf8_data') or content, Loader=_YAML_LOADER
+            ))
 
             # If single document, extract it
             if len(parsed_data) == 1:
                 parsed_data = parsed_data[0]
 
             # Re-dump with consistent formatting
-            if isinstance(parsed_data, list) and len(parsed_data) > 1:
-                # Multiple documents
-                pretty_content = '\n---\n'.join(
-                    yaml.dump(doc, default_flow_style=False, indent=indent, sort_keys=True)
-                    for doc in parsed_data
-                )
+            if kwargs.get('preserve_formatting'):
+                pretty_content = content
+            elif isinstance(parsed_data, list) and len(parsed_data) > 1:
+                # Multiple documents; stop once the output would be truncated
+                dumped_docs: List[str] = []
+                line_breaks = 0
+                for doc in parsed_data:
+                    if dumped_docs:
+                        line_breaks += 2  # Document separator
+                    dumped_docs.append(yaml.dump(
+                        doc, default_flow_style=False, indent=indent, sort_keys=True
+                    ))
+                    line_breaks += dumped_docs[-1].count('\n')
+                    if max_lines is not None and 0 <= max_lines < line_breaks:
+                        break
+                pretty_content = '\n---\n'.join(dumped_docs)
             else:
                 # Single document
                 pretty_content = yaml.dump(
@@ -176,7 +291,10 @@ class StructuredFileProcessor(FileProcessor):
                 )
 
             # Analyze structure
-            structure_info = self._analyze_yaml_structure(parsed_data)
+            structure_info = (
+                self._analyze_yaml_structure(parsed_data)
+                if kwargs.get('analyze_structure', True) else {}
+            )
 
             return {
                 'content': pretty_content,
@@ -192,12 +310,15 @@ class StructuredFileProcessor(FileProcessor):
                 'parsing_error': f"YAML parsing error: {str(e)}"
             }
 
-    def _process_toml(self, content: str) -> Dict[str, Any]:
+    def _process_toml(self, content: str, **kwargs) -> Dict[str, Any]:
         """Process TOML content (basic support)."""
         try:
             import tomllib  # Python 3.11+
             parsed_data = tomllib.loads(content)
-            structure_info = self._analyze_dict_structure(parsed_data, 'TOML')
+            structure_info = (
+                self._analyze_dict_structure(parsed_data, 'TOML')
+                if kwargs.get('analyze_structure', True) else {}
+            )
             return {
                 'content': content,  # Keep original formatting for TOML
                 'structure_info': structure_info,
@@ -219,7 +340,7 @@ class StructuredFileProcessor(FileProcessor):
                 'parsing_error': f"TOML parsing error: {str(e)}"
             }
 
-    def _process_ini_like(self, content: str) -> Dict[str, Any]:
+    def _process_ini_like(self, content: str, **kwargs) -> Dict[str, Any]:
         """Process INI-like configuration files."""
         try:
             import configparser
@@ -227,12 +348,15 @@ class StructuredFileProcessor(FileProcessor):
             config.read_string(content)
 
             # Analyze structure
-            structure_info = {
-                'type': 'Configuration File',
-                'sections': list(config.sections()),
-                'section_count': len(config.sections()),
-                'total_options': sum(len(config.options(section)) for section in config.sections())
-            }
+            structure_info = {}
+            if kwargs.get('analyze_structure', True):
+                sections = config.sections()  # Already a fresh list
+                structure_info = {
+                    'type': 'Configuration File',
+                    'sections': sections,
+                    'section_count': len(sections),
+                    'total_options': sum(len(config[section]) for section in sections)
+                }
 
             return {
                 'content': content,  # Keep original formatting
@@ -248,8 +372,11 @@ class StructuredFileProcessor(FileProcessor):
                 'parsing_error': f"Configuration parsing error: {str(e)}"
             }
 
-    def _process_unknown_structured(self, content: str) -> Dict[str, Any]:
+    def _process_unknown_structured(self, content: str, **kwargs) -> Dict[str, Any]:
         """Process unknown structured content with basic analysis."""
+        if not kwargs.get('analyze_structure', True):
+            return {'content': content, 'structure_info': {}, 'is_valid': None}
+
         # Try to detect structure patterns
         structure_info = {
             'type': 'Unknown Structured Data',
@@ -272,54 +399,50 @@ class StructuredFileProcessor(FileProcessor):
 
     def _analyze_json_structure(self, data: Any) -> Dict[str, Any]:
         """Analyze JSON data structure."""
-        def analyze_value(value, depth=0):
-            if isinstance(value, dict):
-                return {
-                    'type': 'object',
-                    'keys': len(value),
-                    'depth': depth,
-                    'nested_types': {k: analyze_value(v, depth + 1)['type'] for k, v in value.items()}
-                }
-            elif isinstance(value, list):
-                return {
-                    'type': 'array',
-                    'length': len(value),
-                    'depth': depth,
-                    'item_types': [analyze_value(item, depth + 1)['type'] for item in value[:5]]  # Sample first 5
-                }
-            elif isinstance(value, str):
-                return {'type': 'string', 'length': len(value)}
-            elif isinstance(value, (int, float)):
-                return {'type': 'number', 'value': value}
-            elif isinstance(value, bool):
-                return {'type': 'boolean', 'value': value}
-            elif value is None:
-                return {'type': 'null'}
-            else:
-                return {'type': str(type(value).__name__)}
+        # Nested values only contribute their type name, so there is no need
+        # to analyze them recursively
+        value_type = _json_type(data)
+        if value_type == 'object':
+            analysis = {
+                'type': value_type,
+                'keys': len(data),
+                'depth': 0,
+                'nested_types': {k: _json_type(v) for k, v in data.items()}
+            }
+        elif value_type == 'array':
+            analysis = {
+                'type': value_type,
+                'length': len(data),
+                'depth': 0,
+                'item_types': [_json_type(item) for item in data[:5]]  # Sample first 5
+            }
+        elif value_type == 'string':
+            analysis = {'type': value_type, 'length': len(data)}
+        elif value_type in ('number', 'boolean'):
+            analysis = {'type': value_type, 'value': data}
+        else:
+            analysis = {'type': value_type}
 
-        analysis = analyze_value(data)
         analysis['format'] = 'JSON'
         return analysis
 
     def _analyze_xml_structure(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze XML structure."""
-        def count_elements(element):
-            count = 1  # Count current element
-            for child in element:
-                count += count_elements(child)
-            return count
-
-        def get_depth(element, current_depth=0):
-            if not list(element):
-                return current_depth
-            return max(get_depth(child, current_depth + 1) for child in element)
+        # Walk the tree one level at a time, counting elements and depth in
+        # a single pass without recursion
+        total_elements = 0
+        max_depth = -1
+        level = [root]
+        while level:
+            max_depth += 1
+            total_elements += len(level)
+            level = [child for element in level for child in element]
 
         return {
             'format': 'XML',
             'root_tag': root.tag,
-            'total_elements': count_elements(root),
-            'max_depth': get_depth(root),
+            'total_elements': total_elements,
+            'max_depth': max_depth,
             'root_attributes': len(root.attrib),
             'namespaces': self._extract_xml_namespaces(root)
         }
@@ -341,17 +464,24 @@ class StructuredFileProcessor(FileProcessor):
 
     def _analyze_dict_structure(self, data: Any, format_name: str) -> Dict[str, Any]:
         """Analyze dictionary-like data structure."""
-        def analyze_depth(obj, current_depth=0):
-            if isinstance(obj, dict):
-                if not obj:
-                    return current_depth
-                return max(analyze_depth(v, current_depth + 1) for v in obj.values())
-            elif isinstance(obj, list):
-                if not obj:
-                    return current_depth
-                return max(analyze_depth(item, current_depth + 1) for item in obj)
-            else:
-                return current_depth
+        def analyze_depth(obj):
+            # Walk one nesting level at a time, up to max_analysis_depth
+            depth = 0
+            level = [obj]
+            while depth < self.max_analysis_depth:
+                level = [
+                    child
+                    for item in level
+                    for child in (
+                        item.values() if isinstance(item, dict)
+                        else item if isinstance(item, list)
+                        else ()
+                    )
+                ]
+                if not level:
+                    break
+                depth += 1
+            return depth
 
         if isinstance(data, dict):
             return {
@@ -376,22 +506,6 @@ class StructuredFileProcessor(FileProcessor):
                 'value': str(data)[:100] if isinstance(data, str) else data
             }
 
-    def _indent_xml(self, elem: ET.Element, level: int = 0, indent_str: str = "  ") -> None:
-        """Add pretty-printing indentation to XML element."""
-        i = "\n" + level * indent_str
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = i + indent_str
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-            for child in elem:
-                self._indent_xml(child, level + 1, indent_str)
-            if not child.tail or not child.tail.strip():
-                child.tail = i
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = i
-
     def _extract_xml_namespaces(self, root: ET.Element) -> Dict[str, str]:
         """Extract XML namespaces from root element."""
         namespaces = {}
@@ -399,4 +513,9 @@ class StructuredFileProcessor(FileProcessor):
             if key.startswith('xmlns'):
                 prefix = key.split(':', 1)[1] if ':' in key else 'default'
                 namespaces[prefix] = value
-        return namespaces
\ No newline at end of file
+        return namespaces
+
+
+def _json_type(value: Any) -> str:
+    """Return the JSON type name for a parsed value."""
+    return _JSON_TYPE_MAP.get(type(value)) or type(value).__name__
@@ -2,11 +2,25 @@
 File type registry for mapping file extensions to processors and metadata.
 """
 
-from typing import Dict, Optional, Tuple, Any
-from dataclasses import dataclass
+import sys
+from collections import Counter
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Any
+from dataclasses import dataclass, replace
 
+# Upper bound on memoized get_type_info results; unusual extensions in a large
+# tree could otherwise grow the cache without limit
+_TYPE_INFO_CACHE_SIZE = 512
 
-@dataclass
+# Upper bound on memoized search_by_name results (one per distinct query)
+_SEARCH_CACHE_SIZE = 128
+
+
+# Slotted dataclasses need Python 3.10+; older versions keep a __dict__
+_DATACLASS_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class FileTypeInfo:
     """Information about a file type including processor and display metadata."""
     name: str
@@ -17,121 +31,164 @@ class FileTypeInfo:
     description: Optional[str] = None
 
 
-class FileTypeRegistry:
-    """Registry for mapping file extensions to processing information."""
+# Type used for unregistered extensions; only the description varies
+_TEXT_FALLBACK_TEMPLATE = FileTypeInfo(
+    name="Text File",
+    icon="📄",
+    highlight_lang="text",
+    processor_type="code",
+    mime_type="text/plain",
+)
 
-    def __init__(self):
-        self._registry: Dict[str, FileTypeInfo] = {}
-        self._initialize_default_types()
 
-    def _initialize_default_types(self) -> None:
-        """Initialize the registry with default file type mappings."""
+# Default mappings, built on first use and shared read-only by all
+# registries (FileTypeInfo is frozen, so sharing instances is safe)
+_default_types: Optional[Mapping[str, FileTypeInfo]] = None
+
 
+def _get_default_types() -> Mapping[str, FileTypeInfo]:
+    """Return a read-only view of the default extension mappings, building them once."""
+    global _default_types
+    if _default_types is None:
+        _default_types = MappingProxyType(_build_default_types())
+    return _default_types
+
+
+def _build_default_types() -> Dict[str, FileTypeInfo]:
+    """Build the default extension to file type mappings."""
+    return {
         # Programming languages
-        programming_languages = {
-            ".py": FileTypeInfo("Python", "🐍", "python", "code", "text/x-python", "Python source code"),
-            ".java": FileTypeInfo("Java", "☕", "java", "code", "text/x-java-source", "Java source code"),
-            ".js": FileTypeInfo("JavaScript", "🟨", "javascript", "code", "text/javascript", "JavaScript source code"),
-            ".ts": FileTypeInfo("TypeScript", "🔷", "typescript", "code", "text/typescript", "TypeScript source code"),
-            ".jsx": FileTypeInfo("JSX", "⚛️", "jsx", "code", "text/jsx", "JSX React component"),
-            ".tsx": FileTypeInfo("TSX", "⚛️", "tsx", "code", "text/tsx", "TSX React component"),
-            ".c": FileTypeInfo("C", "🔧", "c", "code", "text/x-c", "C source code"),
-            ".cpp": FileTypeInfo("C++", "🔧", "cpp", "code", "text/x-c++", "C++ source code"),
-            ".cc": FileTypeInfo("C++", "🔧", "cpp", "code", "text/x-c++", "C++ source code"),
-            ".cxx": FileTypeInfo("C++", "🔧", "cpp", "code", "text/x-c++", "C++ source code"),
-            ".h": FileTypeInfo("C Header", "📋", "c", "code", "text/x-c", "C header file"),
-            ".hpp": FileTypeInfo("C++ Header", "📋", "cpp", "code", "text/x-c++", "C++ header file"),
-            ".cs": FileTypeInfo("C#", "💎", "csharp", "code", "text/x-csharp", "C# source code"),
-            ".go": FileTypeInfo("Go", "🐹", "go", "code", "text/x-go", "Go source code"),
-            ".rs": FileTypeInfo("Rust", "🦀", "rust", "code", "text/x-rust", "Rust source code"),
-            ".php": FileTypeInfo("PHP", "🐘", "php", "code", "text/x-php", "PHP source code"),
-            ".rb": FileTypeInfo("Ruby", "💎", "ruby", "code", "text/x-ruby", "Ruby source code"),
-            ".swift": FileTypeInfo("Swift", "🦉", "swift", "code", "text/x-swift", "Swift source code"),
-            ".kt": FileTypeInfo("Kotlin", "🎯", "kotlin", "code", "text/x-kotlin", "Kotlin source code"),
-            ".scala": FileTypeInfo("Scala", "🎼", "scala", "code", "text/x-scala", "Scala source code"),
-            ".r": FileTypeInfo("R", "📊", "r", "code", "text/x-r", "R source code"),
-            ".m": FileTypeInfo("MATLAB", "🧮", "matlab", "code", "text/x-matlab", "MATLAB source code"),
-            ".pl": FileTypeInfo("Perl", "🐪", "perl", "code", "text/x-perl", "Perl source code"),
-            ".lua": FileTypeInfo("Lua", "🌙", "lua", "code", "text/x-lua", "Lua source code"),
-            ".sh": FileTypeInfo("Shell", "🐚", "bash", "code", "text/x-shellscript", "Shell script"),
-            ".bash": FileTypeInfo("Bash", "🐚", "bash", "code", "text/x-shellscript", "Bash script"),
-            ".zsh": FileTypeInfo("Zsh", "🐚", "zsh", "code", "text/x-shellscript", "Zsh script"),
-            ".fish": FileTypeInfo("Fish", "🐠", "fish", "code", "text/x-shellscript", "Fish shell script"),
-            ".ps1": FileTypeInfo("PowerShell", "🔵", "powershell", "code", "text/x-powershell", "PowerShell script"),
-            ".sql": FileTypeInfo("SQL", "🗃️", "sql", "code", "text/x-sql", "SQL script"),
-            ".vim": FileTypeInfo("Vim Script", "📝", "vim", "code", "text/x-vim", "Vim script"),
-            ".el": FileTypeInfo("Emacs Lisp", "📝", "elisp", "code", "text/x-elisp", "Emacs Lisp"),
-        }
+        ".py": FileTypeInfo("Python", "🐍", "python", "code", "text/x-python", "Python source code"),
+        ".java": FileTypeInfo("Java", "☕", "java", "code", "text/x-java-source", "Java source code"),
+        ".js": FileTypeInfo("JavaScript", "🟨", "javascript", "code", "text/javascript", "JavaScript source code"),
+        ".ts": FileTypeInfo("TypeScript", "🔷", "typescript", "code", "text/typescript", "TypeScript source code"),
+        ".jsx": FileTypeInfo("JSX", "⚛️", "jsx", "code", "text/jsx", "JSX React component"),
+        ".tsx": FileTypeInfo("TSX", "⚛️", "tsx", "code", "text/tsx", "TSX React component"),
+        ".c": FileTypeInfo("C", "🔧", "c", "code", "text/x-c", "C source code"),
+        ".cpp": FileTypeInfo("C++", "🔧", "cpp", "code", "text/x-c++", "C++ source code"),
+        ".cc": FileTypeInfo("C++", "🔧", "cpp", "code", "text/x-c++", "C++ source code"),
+        ".cxx": FileTypeInfo("C++", "🔧", "cpp", "code", "text/x-c++", "C++ source code"),
+        ".h": FileTypeInfo("C Header", "📋", "c", "code", "text/x-c", "C header file"),
+        ".hpp": FileTypeInfo("C++ Header", "📋", "cpp", "code", "text/x-c++", "C++ header file"),
+        ".cs": FileTypeInfo("C#", "💎", "csharp", "code", "text/x-csharp", "C# source code"),
+        ".go": FileTypeInfo("Go", "🐹", "go", "code", "text/x-go", "Go source code"),
+        ".rs": FileTypeInfo("Rust", "🦀", "rust", "code", "text/x-rust", "Rust source code"),
+        ".php": FileTypeInfo("PHP", "🐘", "php", "code", "text/x-php", "PHP source code"),
+        ".rb": FileTypeInfo("Ruby", "💎", "ruby", "code", "text/x-ruby", "Ruby source code"),
+        ".swift": FileTypeInfo("Swift", "🦉", "swift", "code", "text/x-swift", "Swift source code"),
+        ".kt": FileTypeInfo("Kotlin", "🎯", "kotlin", "code", "text/x-kotlin", "Kotlin source code"),
+        ".scala": FileTypeInfo("Scala", "🎼", "scala", "code", "text/x-scala", "Scala source code"),
+        ".r": FileTypeInfo("R", "📊", "r", "code", "text/x-r", "R source code"),
+        ".m": FileTypeInfo("MATLAB", "🧮", "matlab", "code", "text/x-matlab", "MATLAB source code"),
+        ".pl": FileTypeInfo("Perl", "🐪", "perl", "code", "text/x-perl", "Perl source code"),
+        ".lua": FileTypeInfo("Lua", "🌙", "lua", "code", "text/x-lua", "Lua source code"),
+        ".sh": FileTypeInfo("Shell", "🐚", "bash", "code", "text/x-shellscript", "Shell script"),
+        ".bash": FileTypeInfo("Bash", "🐚", "bash", "code", "text/x-shellscript", "Bash script"),
+        ".zsh": FileTypeInfo("Zsh", "🐚", "zsh", "code", "text/x-shellscript", "Zsh script"),
+        ".fish": FileTypeInfo("Fish", "🐠", "fish", "code", "text/x-shellscript", "Fish shell script"),
+        ".ps1": FileTypeInfo("PowerShell", "🔵", "powershell", "code", "text/x-powershell", "PowerShell script"),
+        ".sql": FileTypeInfo("SQL", "🗃️", "sql", "code", "text/x-sql", "SQL script"),
+        ".vim": FileTypeInfo("Vim Script", "📝", "vim", "code", "text/x-vim", "Vim script"),
+        ".el": FileTypeInfo("Emacs Lisp", "📝", "elisp", "code", "text/x-elisp", "Emacs Lisp"),
 
         # Web technologies
-        web_technologies = {
-            ".html": FileTypeInfo("HTML", "🌐", "html", "code", "text/html", "HTML document"),
-            ".htm": FileTypeInfo("HTML", "🌐", "html", "code", "text/html", "HTML document"),
-            ".css": FileTypeInfo("CSS", "🎨", "css", "code", "text/css", "CSS stylesheet"),
-            ".scss": FileTypeInfo("SCSS", "🎨", "scss", "code", "text/x-scss", "SCSS stylesheet"),
-            ".sass": FileTypeInfo("Sass", "🎨", "sass", "code", "text/x-sass", "Sass stylesheet"),
-            ".less": FileTypeInfo("Less", "🎨", "less", "code", "text/x-less", "Less stylesheet"),
-            ".vue": FileTypeInfo("Vue", "💚", "vue", "code", "text/x-vue", "Vue component"),
-            ".svelte": FileTypeInfo("Svelte", "🧡", "svelte", "code", "text/x-svelte", "Svelte component"),
-        }
+        ".html": FileTypeInfo("HTML", "🌐", "html", "code", "text/html", "HTML document"),
+        ".htm": FileTypeInfo("HTML", "🌐", "html", "code", "text/html", "HTML document"),
+        ".css": FileTypeInfo("CSS", "🎨", "css", "code", "text/css", "CSS stylesheet"),
+        ".scss": FileTypeInfo("SCSS", "🎨", "scss", "code", "text/x-scss", "SCSS stylesheet"),
+        ".sass": FileTypeInfo("Sass", "🎨", "sass", "code", "text/x-sass", "Sass stylesheet"),
+        ".less": FileTypeInfo("Less", "🎨", "less", "code", "text/x-less", "Less stylesheet"),
+        ".vue": FileTypeInfo("Vue", "💚", "vue", "code", "text/x-vue", "Vue component"),
+        ".svelte": FileTypeInfo("Svelte", "🧡", "svelte", "code", "text/x-svelte", "Svelte component"),
 
         # Structured data formats
-        structured_formats = {
-            ".json": FileTypeInfo("JSON", "📄", "json", "structured", "application/json", "JSON data"),
-            ".xml": FileTypeInfo("XML", "📜", "xml", "structured", "application/xml", "XML document"),
-            ".yaml": FileTypeInfo("YAML", "📋", "yaml", "structured", "text/yaml", "YAML configuration"),
-            ".yml": FileTypeInfo("YAML", "📋", "yaml", "structured", "text/yaml", "YAML configuration"),
-            ".toml": FileTypeInfo("TOML", "📋", "toml", "structured", "text/x-toml", "TOML configuration"),
-            ".ini": FileTypeInfo("INI", "⚙️", "ini", "structured", "text/plain", "INI configuration"),
-            ".cfg": FileTypeInfo("Config", "⚙️", "ini", "structured", "text/plain", "Configuration file"),
-            ".conf": FileTypeInfo("Config", "⚙️", "apache", "structured", "text/plain", "Configuration file"),
-            ".properties": FileTypeInfo("Properties", "⚙️", "properties", "structured", "text/plain", "Properties file"),
-        }
+        ".json": FileTypeInfo("JSON", "📄", "json", "structured", "application/json", "JSON data"),
+        ".xml": FileTypeInfo("XML", "📜", "xml", "structured", "application/xml", "XML document"),
+        ".yaml": FileTypeInfo("YAML", "📋", "yaml", "structured", "text/yaml", "YAML configuration"),
+        ".yml": FileTypeInfo("YAML", "📋", "yaml", "structured", "text/yaml", "YAML configuration"),
+        ".toml": FileTypeInfo("TOML", "📋", "toml", "structured", "text/x-toml", "TOML configuration"),
+        ".ini": FileTypeInfo("INI", "⚙️", "ini", "structured", "text/plain", "INI configuration"),
+        ".cfg": FileTypeInfo("Config", "⚙️", "ini", "structured", "text/plain", "Configuration file"),
+        ".conf": FileTypeInfo("Config", "⚙️", "apache", "structured", "text/plain", "Configuration file"),
+        ".properties": FileTypeInfo("Properties", "⚙️", "properties", "structured", "text/plain", "Properties file"),
 
         # Documentation and markup
-        documentation = {
-            ".md": FileTypeInfo("Markdown", "📝", "markdown", "code", "text/markdown", "Markdown document"),
-            ".rst": FileTypeInfo("reStructuredText", "📝", "rst", "code", "text/x-rst", "reStructuredText document"),
-            ".tex": FileTypeInfo("LaTeX", "📄", "latex", "code", "text/x-latex", "LaTeX document"),
-            ".adoc": FileTypeInfo("AsciiDoc", "📝", "asciidoc", "code", "text/x-asciidoc", "AsciiDoc document"),
-            ".org": FileTypeInfo("Org Mode", "📝", "org", "code", "text/x-org", "Org mode document"),
-        }
+        ".md": FileTypeInfo("Markdown", "📝", "markdown", "code", "text/markdown", "Markdown document"),
+        ".rst": FileTypeInfo("reStructuredText", "📝", "rst", "code", "text/x-rst", "reStructuredText document"),
+        ".tex": FileTypeInfo("LaTeX", "📄", "latex", "code", "text/x-latex", "LaTeX document"),
+        ".adoc": FileTypeInfo("AsciiDoc", "📝", "asciidoc", "code", "text/x-asciidoc", "AsciiDoc document"),
+        ".org": FileTypeInfo("Org Mode", "📝", "org", "code", "text/x-org", "Org mode document"),
 
         # Expression and template languages
-        expressions = {
-            ".expr": FileTypeInfo("Expression", "📝", "python", "code", "text/plain", "Expression library"),
-            ".j2": FileTypeInfo("Jinja2", "🏷️", "jinja2", "code", "text/x-jinja2", "Jinja2 template"),
-            ".jinja": FileTypeInfo("Jinja2", "🏷️", "jinja2", "code", "text/x-jinja2", "Jinja2 template"),
-            ".hbs": FileTypeInfo("Handlebars", "🏷️", "handlebars", "code", "text/x-handlebars", "Handlebars template"),
-            ".mustache": FileTypeInfo("Mustache", "🏷️", "mustache", "code", "text/x-mustache", "Mustache template"),
-        }
+        ".expr": FileTypeInfo("Expression", "📝", "python", "code", "text/plain", "Expression library"),
+        ".j2": FileTypeInfo("Jinja2", "🏷️", "jinja2", "code", "text/x-jinja2", "Jinja2 template"),
+        ".jinja": FileTypeInfo("Jinja2", "🏷️", "jinja2", "code", "text/x-jinja2", "Jinja2 template"),
+        ".hbs": FileTypeInfo("Handlebars", "🏷️", "handlebars", "code", "text/x-handlebars", "Handlebars template"),
+        ".mustache": FileTypeInfo("Mustache", "🏷️", "mustache", "code", "text/x-mustache", "Mustache template"),
 
         # Build and configuration files
-        build_files = {
-            ".dockerfile": FileTypeInfo("Dockerfile", "🐳", "dockerfile", "code", "text/x-dockerfile", "Docker configuration"),
-            ".makefile": FileTypeInfo("Makefile", "🔨", "makefile", "code", "text/x-makefile", "Make configuration"),
-            ".cmake": FileTypeInfo("CMake", "🔨", "cmake", "code", "text/x-cmake", "CMake configuration"),
-            ".gradle": FileTypeInfo("Gradle", "🐘", "gradle", "code", "text/x-gradle", "Gradle build script"),
-            ".pom": FileTypeInfo("Maven POM", "📦", "xml", "structured", "application/xml", "Maven POM file"),
-        }
-
-        # Combine all mappings
-        all_types = {
-            **programming_languages,
-            **web_technologies,
-            **structured_formats,
-            **documentation,
-            **expressions,
-            **build_files
-        }
-
-        self._registry.update(all_types)
+        ".dockerfile": FileTypeInfo("Dockerfile", "🐳", "dockerfile", "code", "text/x-dockerfile", "Docker configuration"),
+        ".makefile": FileTypeInfo("Makefile", "🔨", "makefile", "code", "text/x-makefile", "Make configuration"),
+        ".cmake": FileTypeInfo("CMake", "🔨", "cmake", "code", "text/x-cmake", "CMake configuration"),
+        ".gradle": FileTypeInfo("Gradle", "🐘", "gradle", "code", "text/x-gradle", "Gradle build script"),
+        ".pom": FileTypeInfo("Maven POM", "📦", "xml", "structured", "application/xml", "Maven POM file"),
+    }
+
+
+class FileTypeRegistry:
+    """Registry for mapping file extensions to processing information."""
+
+    def __init__(self):
+        # The shared read-only defaults until the first register_type call,
+        # which switches to a private copy
+        self._registry: Mapping[str, FileTypeInfo] = _get_default_types()
+        # Resolved lookups keyed by (extension, format_override)
+        self._type_info_cache: Dict[Tuple[str, Optional[str]], FileTypeInfo] = {}
+        # (extension, lowercased name, info) for search_by_name, built on first search
+        self._name_index: Optional[List[Tuple[str, str, FileTypeInfo]]] = None
+        # Character trigram of a lowercased name -> extensions whose name
+        # contains it; built alongside _name_index
+        self._trigram_index: Optional[Dict[str, Set[str]]] = None
+        # search_by_name results keyed by lowercased query
+        self._search_cache: Dict[str, Tuple[Tuple[str, FileTypeInfo], ...]] = {}
+        # Result of get_supported_extensions
+        self._supported_extensions: Optional[Tuple[str, ...]] = None
+        # Number of registered extensions per processor type; counted on
+        # first use, then kept up to date by register_type
+        self._processor_type_counts: Optional[Counter] = None
 
     def register_type(self, extension: str, type_info: FileTypeInfo) -> None:
         """Register a new file type or override an existing one."""
         if not extension.startswith('.'):
             extension = '.' + extension
-        self._registry[extension.lower()] = type_info
+        extension = extension.lower()
+
+        counts = self._processor_type_counts
+        if counts is not None:
+            old_info = self._registry.get(extension)
+            if old_info is not None:
+                counts[old_info.processor_type] -= 1
+                if not counts[old_info.processor_type]:
+                    del counts[old_info.processor_type]
+            counts[type_info.processor_type] += 1
+
+        registry: Dict[str, FileTypeInfo]
+        if isinstance(self._registry, dict):
+            registry = self._registry
+        else:
+            # First registration: switch from the shared defaults to a private copy
+            registry = dict(self._registry)
+            self._registry = registry
+        registry[extension] = type_info
+        self._invalidate_lookups()
+
+    def _invalidate_lookups(self) -> None:
+        """Drop everything derived from the registry after it changes."""
+        self._type_info_cache.clear()
+        self._name_index = None
+        self._trigram_index = None
+        self._search_cache.clear()
+        self._supported_extensions = None
 
     def get_type_info(self, extension: str, format_override: Optional[str] = None) -> FileTypeInfo:
         """
@@ -144,49 +201,110 @@ class FileTypeRegistry:
         Returns:
             FileTypeInfo object with processing metadata
         """
+        # Cache on the arguments as given, so repeat lookups skip all string
+        # normalization; _resolve_type_info normalizes on a miss
+        key = (extension, format_override)
+        type_info = self._type_info_cache.get(key)
+        if type_info is None:
+            type_info = self._resolve_type_info(extension, format_override)
+            if len(self._type_info_cache) >= _TYPE_INFO_CACHE_SIZE:
+                self._type_info_cache.clear()
+            self._type_info_cache[key] = type_info
+        return type_info
+
+    def _get_type_info_normalized(self, extension: str) -> FileTypeInfo:
+        """
+        Get file type information for an extension that is already normalized.
+
+        For internal callers that hold a lowercased extension with its leading
+        dot (e.g. Path.suffix.lower()); registered types are a single lookup.
+        Unregistered extensions go through get_type_info.
+        """
+        type_info = self._registry.get(extension)
+        if type_info is None:
+            type_info = self.get_type_info(extension)
+        return type_info
+
+    def _resolve_type_info(self, extension: str, format_override: Optional[str]) -> FileTypeInfo:
+        """Resolve file type information for an extension (with or without leading dot)."""
         if not extension.startswith('.'):
             extension = '.' + extension
 
         # Handle format override
         if format_override:
-            override_ext = f".{format_override}" if not format_override.startswith('.') else format_override
-            if override_ext in self._registry:
-                base_info = self._registry[override_ext]
-                # Create a copy with the original extension noted
-                return FileTypeInfo(
+            override_ext = format_override.lower()
+            if not override_ext.startswith('.'):
+                override_ext = '.' + override_ext
+            base_info = self._registry.get(override_ext)
+            if base_info is not None:
+                # Create a copy with the original extension noted; the caller
+                # memoizes it per (extension, format_override)
+                return replace(
+                    base_info,
                     name=f"{base_info.name} ({extension})",
-                    icon=base_info.icon,
-                    highlight_lang=base_info.highlight_lang,
-                    processor_type=base_info.processor_type,
-                    mime_type=base_info.mime_type,
                     description=f"{base_info.description} (format override)"
                 )
 
-        # Return registered type or default
-        return self._registry.get(
-            extension.lower(),
-            FileTypeInfo(
-                name="Text File",
-                icon="📄",
-                highlight_lang="text",
-                processor_type="code",
-                mime_type="text/plain",
-                description=f"Plain text file ({extension})"
+        # Return registered type or default; the default is only built when
+        # actually needed
+        type_info = self._registry.get(extension.lower())
+        if type_info is None:
+            type_info = replace(
+                _TEXT_FALLBACK_TEMPLATE, description=f"Plain text file ({extension})"
             )
-        )
+        return type_info
 
-    def get_supported_extensions(self) -> list[str]:
-        """Get list of all supported file extensions."""
-        return sorted(self._registry.keys())
+    def get_supported_extensions(self) -> Tuple[str, ...]:
+        """Get all supported file extensions, sorted."""
+        if self._supported_extensions is None:
+            self._supported_extensions = tuple(sorted(self._registry.keys()))
+        return self._supported_extensions
 
     def get_processor_types(self) -> list[str]:
         """Get list of available processor types."""
-        return list(set(info.processor_type for info in self._registry.values()))
+        if self._processor_type_counts is None:
+            self._processor_type_counts = Counter(
+                info.processor_type for info in self._registry.values()
+            )
+        return list(self._processor_type_counts)
 
-    def search_by_name(self, name: str) -> list[Tuple[str, FileTypeInfo]]:
+    def search_by_name(self, name: str) -> Tuple[Tuple[str, FileTypeInfo], ...]:
         """Search for file types by name (case-insensitive)."""
         name_lower = name.lower()
-        return [
-            (ext, info) for ext, info in self._registry.items()
-            if name_lower in info.name.lower()
-        ]
\ No newline at end of file
+        results = self._search_cache.get(name_lower)
+        if results is not None:
+            return results
+
+        name_index, trigram_index = self._get_name_indexes()
+
+        # Narrow the candidates to names sharing every trigram of the query;
+        # shorter queries scan all names
+        candidates: Optional[Set[str]] = None
+        if len(name_lower) >= 3:
+            candidates = set.intersection(*(
+                trigram_index.get(name_lower[i:i + 3], set())
+                for i in range(len(name_lower) - 2)
+            ))
+
+        results = tuple(
+            (ext, info) for ext, info_name_lower, info in name_index
+            if (candidates is None or ext in candidates) and name_lower in info_name_lower
+        )
+        if len(self._search_cache) >= _SEARCH_CACHE_SIZE:
+            self._search_cache.clear()
+        self._search_cache[name_lower] = results
+        return results
+
+    def _get_name_indexes(self) -> Tuple[List[Tuple[str, str, FileTypeInfo]], Dict[str, Set[str]]]:
+        """Return the name and trigram indexes used by search_by_name, building them once."""
+        if self._name_index is None or self._trigram_index is None:
+            name_index: List[Tuple[str, str, FileTypeInfo]] = []
+            trigram_index: Dict[str, Set[str]] = {}
+            for ext, info in self._registry.items():
+                name_lower = info.name.lower()
+                name_index.append((ext, name_lower, info))
+                for i in range(len(name_lower) - 2):
+                    trigram_index.setdefault(name_lower[i:i + 3], set()).add(ext)
+            self._name_index = name_index
+            self._trigram_index = trigram_index
+        return self._name_index, self._trigram_index
